@@ -0,0 +1,661 @@
+import os
+import customtkinter as ctk
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import messagebox, simpledialog, filedialog
+from tkinter.colorchooser import askcolor
+import storage
+import selection
+import instrument
+import render_cache
+from wheel_widget import WheelWidget
+from entry_list import EntryList
+from entry_table import EntryTable
+
+try:
+    import ctypes
+except ImportError:
+    ctypes = None
+
+def apply_dark_title_bar(window):
+    """
+    Forces the title bar to be dark on Windows 10/11.
+    """
+    if ctypes:
+        try:
+            hwnd = ctypes.windll.user32.GetParent(window.winfo_id())
+            # DWMWA_USE_IMMERSIVE_DARK_MODE = 20
+            value = ctypes.c_int(1) # 1 = True
+            ctypes.windll.dwmapi.DwmSetWindowAttribute(hwnd, 20, ctypes.byref(value), 4)
+        except Exception as e:
+            pass
+
+ctk.set_appearance_mode("System")
+ctk.set_default_color_theme("blue")
+
+class App(ctk.CTk):
+    def __init__(self):
+        super().__init__()
+
+        self.title("Random Wheel Spinner")
+        self.geometry("900x600")
+
+        # Data
+        self.entries = EntryTable() # Rows behave like dicts {'label': str, 'weight': float}
+        self.current_config_name = None
+        self.autosave = None # Set by finish_startup
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        # Hidden profiling controls, see instrument.py
+        self.bind("<F12>", lambda e: self.toggle_profiling())
+        self.bind("<Shift-F12>", lambda e: self.dump_profile())
+
+        # Layout
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        self.tab_view = ctk.CTkTabview(self, command=self.on_tab_changed)
+        self.tab_view.grid(row=0, column=0, padx=20, pady=20, sticky="nsew")
+        
+        self.tab_spinner = self.tab_view.add("Spinner")
+        self.tab_configs = self.tab_view.add("Configurations")
+
+        # Rendered wheels and config thumbnails persist across runs
+        self.render_cache = render_cache.RenderCache(render_cache.get_cache_dir())
+        self.thumbnails = None
+        self.thumb_labels = {}
+        self.thumb_poll_job = None
+
+        # Startup is staged so the window shows up before any data is read:
+        # 1. build the spinner tab with a placeholder wheel (the
+        #    Configurations tab is built on first view),
+        # 2. read the autosave on a worker thread meanwhile,
+        # 3. once the window has painted, show the entries and start the
+        #    wheel render (on the widget's worker), see finish_startup.
+        self.setup_spinner_tab()
+        self.wheel.render_cache = self.render_cache
+        self.wheel.loading = True
+        self.btn_add.configure(state="disabled")
+        self.on_entries_changed()
+        instrument.STARTUP.mark("window")
+
+        loader = ThreadPoolExecutor(max_workers=1)
+        self.autosave_future = loader.submit(storage.AutosaveService)
+        loader.shutdown(wait=False)
+        self.painted = False
+        self.wheel.bind("<Expose>", self.on_first_paint, add="+")
+
+    def on_first_paint(self, event):
+        if self.painted:
+            return
+        self.painted = True
+        instrument.STARTUP.mark("first_paint")
+        self.poll_startup()
+
+    def poll_startup(self):
+        if self.autosave is not None:
+            return
+        if not self.autosave_future.done():
+            self.after(16, self.poll_startup)
+            return
+        self.finish_startup()
+
+    def finish_startup(self):
+        """
+        Shows the autosaved entries and makes the app interactive. Waits for
+        the autosave if it is still loading, so anything that needs it can
+        call this first.
+        """
+        if self.autosave is not None:
+            return
+        self.autosave = self.autosave_future.result()
+        self.entries = self.autosave.entries.copy()
+        self.update_entry_list()
+        self.wheel.set_entries(self.entries)
+        self.btn_add.configure(state="normal")
+        instrument.STARTUP.mark("interactive")
+        instrument.STARTUP.log(storage.get_data_dir())
+
+    def on_tab_changed(self):
+        if self.tab_view.get() == "Configurations" and self.thumbnails is None:
+            self.setup_configs_tab()
+
+    def setup_spinner_tab(self):
+        self.tab_spinner.grid_columnconfigure(0, weight=1) # Wheel
+        self.tab_spinner.grid_columnconfigure(1, weight=0) # Controls
+        self.tab_spinner.grid_rowconfigure(0, weight=1)
+
+        # Wheel Area
+        self.wheel_frame = ctk.CTkFrame(self.tab_spinner, fg_color="transparent")
+        self.wheel_frame.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
+        
+        self.wheel = WheelWidget(self.wheel_frame, width=400, height=400, bg="#2B2B2B", highlightthickness=0) 
+        self.wheel.pack(expand=True, fill="both")
+
+        # Controls Area
+        self.controls_frame = ctk.CTkFrame(self.tab_spinner, width=300)
+        self.controls_frame.grid(row=0, column=1, padx=10, pady=10, sticky="nsew")
+        self.controls_frame.grid_rowconfigure(3, weight=1) # Listbox expands
+
+        # Add Entry
+        self.add_frame = ctk.CTkFrame(self.controls_frame, fg_color="transparent")
+        self.add_frame.grid(row=0, column=0, padx=10, pady=10, sticky="ew")
+        
+        self.entry_name = ctk.CTkEntry(self.add_frame, placeholder_text="Entry Name")
+        self.entry_name.pack(side="left", fill="x", expand=True, padx=(0, 5))
+        
+        self.entry_weight = ctk.CTkEntry(self.add_frame, placeholder_text="Weight (1.0)", width=80)
+        self.entry_weight.pack(side="left", padx=(0, 5))
+        
+        self.btn_add = ctk.CTkButton(self.add_frame, text="+", width=40, command=self.add_entry)
+        self.btn_add.pack(side="left")
+
+        # Spin Button
+        self.btn_spin = ctk.CTkButton(self.controls_frame, text="SPIN THE WHEEL!", height=50, font=("Arial", 16, "bold"), command=self.spin_wheel)
+        self.btn_spin.grid(row=1, column=0, padx=10, pady=10, sticky="ew")
+
+        # Draw N Button
+        self.btn_draw = ctk.CTkButton(self.controls_frame, text="Draw N...", command=self.draw_many_dialog)
+        self.btn_draw.grid(row=2, column=0, padx=10, pady=(0, 10), sticky="ew")
+
+        # Entries List
+        self.list_frame = EntryList(self.controls_frame, label_text="Entries",
+                                    on_edit=self.edit_entry, on_delete=self.remove_entry)
+        self.list_frame.grid(row=3, column=0, padx=10, pady=10, sticky="nsew")
+
+        # Save Button
+        self.btn_save_current = ctk.CTkButton(self.controls_frame, text="Save Configuration", command=self.save_current_config)
+        self.btn_save_current.grid(row=4, column=0, padx=10, pady=10, sticky="ew")
+        
+        # Result Label
+        self.lbl_result = ctk.CTkLabel(self.tab_spinner, text="", font=("Arial", 24, "bold"))
+        self.lbl_result.grid(row=1, column=0, columnspan=2, pady=10)
+
+    def setup_configs_tab(self):
+        self.thumbnails = render_cache.ThumbnailService(self.render_cache, self.wheel.colors)
+        self.tab_configs.grid_columnconfigure(0, weight=1)
+        self.tab_configs.grid_rowconfigure(0, weight=1)
+
+        self.config_list_frame = ctk.CTkScrollableFrame(self.tab_configs, label_text="Saved Configurations")
+        self.config_list_frame.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
+
+        self.config_actions_frame = ctk.CTkFrame(self.tab_configs)
+        self.config_actions_frame.grid(row=1, column=0, padx=10, pady=10, sticky="ew")
+
+        self.btn_refresh = ctk.CTkButton(self.config_actions_frame, text="Refresh", command=self.refresh_configs)
+        self.btn_refresh.pack(side="left", padx=5)
+
+        self.btn_import = ctk.CTkButton(self.config_actions_frame, text="Import...", command=self.import_config_action)
+        self.btn_import.pack(side="left", padx=5)
+
+        self.refresh_configs()
+
+    def add_entry(self):
+        name = self.entry_name.get().strip()
+        weight_str = self.entry_weight.get().strip()
+        
+        if not name:
+            return
+        
+        try:
+            weight = float(weight_str) if weight_str else 1.0
+        except ValueError:
+            messagebox.showerror("Error", "Weight must be a number")
+            return
+
+        entry = {'label': name, 'weight': weight}
+        self.entries.append(entry)
+        self.entry_name.delete(0, 'end')
+        self.entry_weight.delete(0, 'end')
+        self.list_frame.insert(len(self.entries) - 1)
+        self.autosave.add(len(self.entries) - 1, entry)
+        self.on_entries_changed()
+        self.wheel.set_entries(self.entries)
+
+    def remove_entry(self, index):
+        del self.entries[index]
+        self.list_frame.remove(index)
+        self.autosave.remove(index)
+        self.on_entries_changed()
+        self.wheel.set_entries(self.entries)
+
+    def edit_entry(self, index):
+        entry = self.entries[index]
+        
+        dialog = ctk.CTkToplevel(self)
+        dialog.title("Edit Entry")
+        dialog.geometry("350x250")
+        
+        # Center dialog relative to main window
+        x = self.winfo_x() + (self.winfo_width() // 2) - 175
+        y = self.winfo_y() + (self.winfo_height() // 2) - 125
+        dialog.geometry(f"+{x}+{y}")
+        
+        # Make it modal
+        dialog.transient(self)
+        dialog.grab_set()
+        dialog.focus_force()
+        
+        # Apply dark title bar fix
+        dialog.update()
+        apply_dark_title_bar(dialog)
+        
+        # Grid Layout
+        dialog.grid_columnconfigure(1, weight=1)
+        
+        ctk.CTkLabel(dialog, text="Name:").grid(row=0, column=0, padx=10, pady=10, sticky="e")
+        name_entry = ctk.CTkEntry(dialog)
+        name_entry.insert(0, entry['label'])
+        name_entry.grid(row=0, column=1, padx=10, pady=10, sticky="ew")
+        
+        ctk.CTkLabel(dialog, text="Weight:").grid(row=1, column=0, padx=10, pady=10, sticky="e")
+        weight_entry = ctk.CTkEntry(dialog)
+        weight_entry.insert(0, f"{entry['weight']:g}")
+        weight_entry.grid(row=1, column=1, padx=10, pady=10, sticky="ew")
+        
+        # Color Selection
+        current_color = entry.get('color')
+        if not current_color:
+            # Default to the palette color that would be used
+            current_color = self.wheel.colors[index % len(self.wheel.colors)]
+            
+        self.selected_color = current_color
+        
+        ctk.CTkLabel(dialog, text="Color:").grid(row=2, column=0, padx=10, pady=10, sticky="e")
+        
+        color_btn = ctk.CTkButton(dialog, text="", fg_color=current_color, width=40, height=28, border_width=2, border_color="gray")
+        
+        def pick_color():
+            color = askcolor(color=self.selected_color, title="Choose Entry Color")[1]
+            if color:
+                self.selected_color = color
+                color_btn.configure(fg_color=color)
+                
+        color_btn.configure(command=pick_color)
+        color_btn.grid(row=2, column=1, padx=10, pady=10, sticky="w")
+        
+        def save():
+            new_name = name_entry.get().strip()
+            new_weight_str = weight_entry.get().strip()
+            
+            if not new_name:
+                return
+            
+            try:
+                new_weight = float(new_weight_str)
+            except ValueError:
+                messagebox.showerror("Error", "Weight must be a number")
+                return
+                
+            self.entries[index] = {
+                'label': new_name, 
+                'weight': new_weight,
+                'color': self.selected_color
+            }
+            self.list_frame.update_row(index)
+            self.autosave.edit(index, self.entries[index])
+            self.on_entries_changed()
+            self.wheel.set_entries(self.entries)
+            dialog.destroy()
+            
+        ctk.CTkButton(dialog, text="Save", command=save).grid(row=3, column=0, columnspan=2, pady=20)
+
+    def update_entry_list(self):
+        # Show and save a whole new entries list
+        with instrument.span("entries.update"):
+            self.list_frame.set_entries(self.entries)
+            self.autosave.reset(self.entries)
+            self.on_entries_changed()
+
+    def on_entries_changed(self):
+        # Update spin button state
+        if self.entries:
+            self.btn_spin.configure(state="normal")
+            self.btn_draw.configure(state="normal")
+        else:
+            self.btn_spin.configure(state="disabled")
+            self.btn_draw.configure(state="disabled")
+
+    def toggle_profiling(self):
+        instrument.set_enabled(not instrument.enabled())
+        self.wheel.update_hud(force=True)
+
+    def dump_profile(self):
+        if not instrument.enabled():
+            return
+        # Own folder: the data dir's *.json files are listed as configs
+        directory = os.path.join(storage.get_data_dir(), "profiles")
+        report_path, trace_path = instrument.PROFILER.dump(directory)
+        self.lbl_result.configure(text=f"Profile saved: {trace_path}")
+
+    def on_close(self):
+        if self.thumbnails is not None:
+            self.thumbnails.close()
+        self.finish_startup()
+        self.autosave.close()
+        self.destroy()
+
+    def spin_wheel(self):
+        self.wheel.hide_overlay()
+        self.lbl_result.configure(text="Spinning...")
+        self.btn_spin.configure(state="disabled")
+        self.wheel.spin(callback=self.on_spin_end)
+
+    def on_spin_end(self, winner):
+        self.lbl_result.configure(text=f"Winner: {winner['label']}!")
+        self.btn_spin.configure(state="normal" if self.entries else "disabled")
+        self.wheel.show_notification("WINNER!", winner['label'])
+
+    def draw_many_dialog(self):
+        if not self.entries:
+            return
+
+        dialog = ctk.CTkToplevel(self)
+        dialog.title("Draw Winners")
+        dialog.geometry("320x220")
+        
+        # Center dialog
+        x = self.winfo_x() + (self.winfo_width() // 2) - 160
+        y = self.winfo_y() + (self.winfo_height() // 2) - 110
+        dialog.geometry(f"+{x}+{y}")
+        
+        dialog.transient(self)
+        dialog.grab_set()
+        dialog.focus_force()
+        
+        # Apply dark title bar fix
+        dialog.update()
+        apply_dark_title_bar(dialog)
+        
+        dialog.grid_columnconfigure(1, weight=1)
+        
+        ctk.CTkLabel(dialog, text="Winners:").grid(row=0, column=0, padx=10, pady=10, sticky="e")
+        count_entry = ctk.CTkEntry(dialog)
+        count_entry.insert(0, "1")
+        count_entry.grid(row=0, column=1, padx=10, pady=10, sticky="ew")
+        count_entry.focus_set()
+        
+        ctk.CTkLabel(dialog, text="Seed:").grid(row=1, column=0, padx=10, pady=10, sticky="e")
+        seed_entry = ctk.CTkEntry(dialog, placeholder_text="Random")
+        seed_entry.grid(row=1, column=1, padx=10, pady=10, sticky="ew")
+        
+        unique_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(dialog, text="Unique winners (no repeats)", variable=unique_var).grid(row=2, column=0, columnspan=2, padx=10, pady=10)
+        
+        def on_draw():
+            try:
+                count = int(count_entry.get().strip())
+                seed_str = seed_entry.get().strip()
+                seed = int(seed_str) if seed_str else None
+            except ValueError:
+                messagebox.showerror("Error", "Winners and seed must be whole numbers")
+                return
+            
+            try:
+                winners = selection.draw(self.entries, count, seed=seed, replace=not unique_var.get())
+            except ValueError as e:
+                messagebox.showerror("Error", str(e))
+                return
+            
+            dialog.destroy()
+            self.show_draw_results(winners, unique_var.get())
+        
+        ctk.CTkButton(dialog, text="Draw", command=on_draw).grid(row=3, column=0, columnspan=2, pady=10)
+        
+        # Allow Enter key to draw
+        dialog.bind("<Return>", lambda e: on_draw())
+
+    def show_draw_results(self, winners, unique):
+        max_lines = 1000 # Keep the textbox responsive for huge draws
+        
+        if unique:
+            lines = [f"{i + 1}. {w['label']}" for i, w in enumerate(winners[:max_lines])]
+            truncated = len(winners) > max_lines
+        else:
+            # Tally repeated winners, most frequent first
+            counts = {}
+            for w in winners:
+                counts[w['label']] = counts.get(w['label'], 0) + 1
+            tally = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+            lines = [f"{label}: {count}" for label, count in tally[:max_lines]]
+            truncated = len(tally) > max_lines
+        
+        self.lbl_result.configure(text=f"Drew {len(winners)} winner(s)")
+        
+        dialog = ctk.CTkToplevel(self)
+        dialog.title(f"Draw Results ({len(winners)})")
+        dialog.geometry("360x400")
+        dialog.transient(self)
+        
+        dialog.update()
+        apply_dark_title_bar(dialog)
+        
+        textbox = ctk.CTkTextbox(dialog)
+        textbox.pack(expand=True, fill="both", padx=10, pady=10)
+        textbox.insert("end", "\n".join(lines))
+        if truncated:
+            textbox.insert("end", "\n...")
+        textbox.configure(state="disabled")
+        
+        ctk.CTkButton(dialog, text="Close", command=dialog.destroy, width=80).pack(pady=(0, 10))
+
+    def save_current_config(self):
+        if not self.entries:
+            messagebox.showwarning("Warning", "No entries to save!")
+            return
+
+        # Custom Dialog
+        dialog = ctk.CTkToplevel(self)
+        dialog.title("Save Configuration")
+        dialog.geometry("300x160")
+        
+        # Center dialog
+        x = self.winfo_x() + (self.winfo_width() // 2) - 150
+        y = self.winfo_y() + (self.winfo_height() // 2) - 80
+        dialog.geometry(f"+{x}+{y}")
+        
+        dialog.transient(self)
+        dialog.grab_set()
+        dialog.focus_force()
+        
+        # Apply dark title bar fix
+        dialog.update()
+        apply_dark_title_bar(dialog)
+        
+        ctk.CTkLabel(dialog, text="Enter configuration name:").pack(pady=(20, 5))
+        
+        name_entry = ctk.CTkEntry(dialog)
+        if self.current_config_name:
+            name_entry.insert(0, self.current_config_name)
+        name_entry.pack(pady=5, padx=20, fill="x")
+        name_entry.focus_set()
+        
+        def on_save():
+            name = name_entry.get().strip()
+            if name:
+                storage.save_config(name, self.entries)
+                self.current_config_name = name
+                self.refresh_configs()
+                
+                self.tab_view.set("Spinner")
+                self.wheel.show_notification("Saved!", f"Configuration '{name}'\nsaved successfully!", color="#2CC985")
+                dialog.destroy()
+        
+        btn_frame = ctk.CTkFrame(dialog, fg_color="transparent")
+        btn_frame.pack(pady=15)
+        
+        ctk.CTkButton(btn_frame, text="Save", command=on_save, width=80).pack(side="left", padx=5)
+        ctk.CTkButton(btn_frame, text="Cancel", command=dialog.destroy, width=80, fg_color="transparent", border_width=1, border_color="gray").pack(side="left", padx=5)
+        
+        # Allow Enter key to save
+        dialog.bind("<Return>", lambda e: on_save())
+
+    def refresh_configs(self):
+        if self.thumbnails is None:
+            return # The Configurations tab lists everything when first shown
+        # Clear list
+        for widget in self.config_list_frame.winfo_children():
+            widget.destroy()
+            
+        configs = storage.list_config_info()
+        # Thumbnails that are out of date are rendered in the background
+        ready = self.thumbnails.request(configs)
+        self.thumb_labels = {}
+        
+        for meta in configs:
+            name = meta["name"]
+            row = ctk.CTkFrame(self.config_list_frame)
+            row.pack(fill="x", pady=5)
+            
+            size = render_cache.THUMBNAIL_SIZE
+            thumb = ctk.CTkLabel(row, text="", width=size, height=size)
+            thumb.pack(side="left", padx=(10, 0))
+            self.thumb_labels[name] = thumb
+            if name in ready:
+                self.set_thumbnail(name, ready[name])
+            
+            lbl = ctk.CTkLabel(row, text=name, font=("Arial", 14))
+            lbl.pack(side="left", padx=10)
+            
+            # Buttons
+            btn_del = ctk.CTkButton(row, text="Delete", width=60, fg_color="#FF5555", hover_color="#CC0000",
+                                    command=lambda n=name: self.delete_config_action(n))
+            btn_del.pack(side="right", padx=5)
+            
+            btn_rename = ctk.CTkButton(row, text="Rename", width=60,
+                                       command=lambda n=name: self.rename_config_action(n))
+            btn_rename.pack(side="right", padx=5)
+            
+            btn_export = ctk.CTkButton(row, text="Export", width=60,
+                                       command=lambda n=name: self.export_config_action(n))
+            btn_export.pack(side="right", padx=5)
+            
+            btn_load = ctk.CTkButton(row, text="Load", width=60, fg_color="#2CC985", hover_color="#229966",
+                                     command=lambda n=name: self.load_config_action(n))
+            btn_load.pack(side="right", padx=5)
+
+        if self.thumbnails.busy() and self.thumb_poll_job is None:
+            self.thumb_poll_job = self.after(100, self.poll_thumbnails)
+
+    def poll_thumbnails(self):
+        self.thumb_poll_job = None
+        for name, image in self.thumbnails.poll().items():
+            self.set_thumbnail(name, image)
+        if self.thumbnails.busy():
+            self.thumb_poll_job = self.after(100, self.poll_thumbnails)
+
+    def set_thumbnail(self, name, image):
+        label = self.thumb_labels.get(name)
+        if label is None or not label.winfo_exists():
+            return
+        label.configure(image=ctk.CTkImage(light_image=image, dark_image=image, size=image.size))
+
+    def load_config_action(self, name):
+        self.finish_startup() # Or the autosave would replace the loaded wheel
+        data = storage.load_config(name)
+        if data:
+            self.entries = EntryTable.coerce(data.get('entries', []))
+            self.current_config_name = data.get('name', name)
+            self.update_entry_list()
+            self.wheel.set_entries(self.entries)
+            self.tab_view.set("Spinner") # Switch tab
+            self.lbl_result.configure(text=f"Loaded: {name}")
+
+    def import_config_action(self):
+        path = filedialog.askopenfilename(title="Import Configuration",
+                                          filetypes=[("Wheel files", "*.json *.wheel"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            name = storage.import_config(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not import file:\n{e}")
+            return
+        self.refresh_configs()
+        self.lbl_result.configure(text=f"Imported: {name}")
+
+    def export_config_action(self, name):
+        path = filedialog.asksaveasfilename(title="Export Configuration", initialfile=f"{name}.json",
+                                            defaultextension=".json", filetypes=[("JSON", "*.json")])
+        if not path:
+            return
+        try:
+            storage.export_config(name, path)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not export file:\n{e}")
+
+    def delete_config_action(self, name):
+        # Custom Dialog
+        dialog = ctk.CTkToplevel(self)
+        dialog.title("Confirm Delete")
+        dialog.geometry("300x120")
+        
+        # Center dialog
+        x = self.winfo_x() + (self.winfo_width() // 2) - 150
+        y = self.winfo_y() + (self.winfo_height() // 2) - 60
+        dialog.geometry(f"+{x}+{y}")
+        
+        dialog.transient(self)
+        dialog.grab_set()
+        dialog.focus_force()
+        
+        # Apply dark title bar fix
+        dialog.update()
+        apply_dark_title_bar(dialog)
+        
+        ctk.CTkLabel(dialog, text=f"Are you sure you want to delete\n'{name}'?", font=("Arial", 14)).pack(pady=(20, 10))
+        
+        def on_delete():
+            storage.delete_config(name)
+            self.refresh_configs()
+            dialog.destroy()
+        
+        btn_frame = ctk.CTkFrame(dialog, fg_color="transparent")
+        btn_frame.pack(pady=10)
+        
+        ctk.CTkButton(btn_frame, text="Delete", command=on_delete, width=80, fg_color="#FF5555", hover_color="#CC0000").pack(side="left", padx=5)
+        ctk.CTkButton(btn_frame, text="Cancel", command=dialog.destroy, width=80, fg_color="transparent", border_width=1, border_color="gray").pack(side="left", padx=5)
+
+    def rename_config_action(self, name):
+        # Custom Dialog
+        dialog = ctk.CTkToplevel(self)
+        dialog.title("Rename Configuration")
+        dialog.geometry("300x160")
+        
+        # Center dialog
+        x = self.winfo_x() + (self.winfo_width() // 2) - 150
+        y = self.winfo_y() + (self.winfo_height() // 2) - 80
+        dialog.geometry(f"+{x}+{y}")
+        
+        dialog.transient(self)
+        dialog.grab_set()
+        dialog.focus_force()
+        
+        # Apply dark title bar fix
+        dialog.update()
+        apply_dark_title_bar(dialog)
+        
+        ctk.CTkLabel(dialog, text=f"Enter new name for '{name}':").pack(pady=(20, 5))
+        
+        name_entry = ctk.CTkEntry(dialog)
+        name_entry.insert(0, name)
+        name_entry.pack(pady=5, padx=20, fill="x")
+        name_entry.focus_set()
+        name_entry.select_range(0, 'end')
+        
+        def on_rename():
+            new_name = name_entry.get().strip()
+            if new_name and new_name != name:
+                storage.rename_config(name, new_name)
+                self.refresh_configs()
+                dialog.destroy()
+            elif new_name == name:
+                dialog.destroy()
+        
+        btn_frame = ctk.CTkFrame(dialog, fg_color="transparent")
+        btn_frame.pack(pady=15)
+        
+        ctk.CTkButton(btn_frame, text="Rename", command=on_rename, width=80).pack(side="left", padx=5)
+        ctk.CTkButton(btn_frame, text="Cancel", command=dialog.destroy, width=80, fg_color="transparent", border_width=1, border_color="gray").pack(side="left", padx=5)
+        
+        # Allow Enter key to save
+        dialog.bind("<Return>", lambda e: on_rename())
@@ -0,0 +1,71 @@
+"""
+Compares batched selection.draw against looping WheelWidget.get_winner.
+
+Run from the project root:
+    python benchmarks/bench_selection.py [--entries 10000] [--draws 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import selection
+from entry_table import EntryTable
+
+
+def make_entries(count, seed=0):
+    rng = random.Random(seed)
+    return [{'label': f"Entry {i}", 'weight': rng.uniform(0.1, 10.0)} for i in range(count)]
+
+
+def loop_get_winner(entries, draws, seed=0):
+    # Imported lazily since the widget pulls in Tk and PIL
+    from wheel_widget import WheelWidget
+
+    # get_winner only needs the entry index, so skip Tk canvas creation
+    wheel = WheelWidget.__new__(WheelWidget)
+    wheel.entries = EntryTable(entries)
+    wheel.rebuild_index()
+    rng = random.Random(seed)
+    winners = []
+    for _ in range(draws):
+        wheel.angle = rng.uniform(0, 360)
+        winners.append(wheel.get_winner())
+    return winners
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--draws", type=int, default=100000)
+    args = parser.parse_args()
+
+    entries = make_entries(args.entries)
+    results = []
+
+    results.append(("get_winner loop", timed(loop_get_winner, entries, args.draws)))
+    results.append(("alias (python)", timed(
+        lambda: selection.WeightedSampler(entries, use_numpy=False).draw(args.draws, seed=0))))
+    if selection.np is not None:
+        results.append(("alias (numpy)", timed(
+            lambda: selection.WeightedSampler(entries).draw(args.draws, seed=0))))
+    results.append(("unique (python)", timed(
+        lambda: selection.WeightedSampler(entries, use_numpy=False).draw(
+            min(args.draws, args.entries), seed=0, replace=False))))
+
+    print(f"{args.entries} entries, {args.draws} draws")
+    for name, seconds in results:
+        print(f"  {name:<18} {seconds * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
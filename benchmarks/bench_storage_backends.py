@@ -0,0 +1,67 @@
+"""
+Compares the JSON and SQLite storage backends.
+
+Run from the project root:
+    python benchmarks/bench_storage_backends.py [--sizes 10 1000 10000 100000]
+
+Uses a throwaway data directory, never your real saved wheels.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import storage
+from bench_selection import make_entries
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def run_backend(backend, sizes, wheels):
+    results = {}
+    for size in sizes:
+        entries = make_entries(size)
+        row = {}
+        row["save"] = timed(storage.save_config, f"Wheel {size}", entries)
+        row["load"] = timed(storage.load_config, f"Wheel {size}")
+        row["first 100"] = timed(storage.load_entries, f"Wheel {size}", 100)
+        row["rename"] = timed(storage.rename_config, f"Wheel {size}", f"Renamed {size}")
+        results[size] = row
+
+    # Listing with several wheels of the largest size on disk
+    for i in range(wheels):
+        storage.save_config(f"Extra {i}", make_entries(sizes[-1], seed=i))
+    storage.list_configs() # Warm the JSON metadata index
+    list_time = timed(storage.list_configs)
+    return results, list_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000, 100000])
+    parser.add_argument("--wheels", type=int, default=10, help="extra wheels saved before timing list_configs")
+    args = parser.parse_args()
+
+    for backend in ("json", "sqlite"):
+        with tempfile.TemporaryDirectory() as data_dir:
+            storage.get_data_dir = lambda: data_dir
+            storage.set_backend(backend)
+            results, list_time = run_backend(backend, args.sizes, args.wheels)
+            storage.set_backend("json")
+
+        print(f"{backend}:")
+        for size, row in results.items():
+            cells = "  ".join(f"{name} {seconds * 1000:9.1f} ms" for name, seconds in row.items())
+            print(f"  {size:>7} entries  {cells}")
+        print(f"  list_configs ({args.wheels + len(args.sizes)} wheels) {list_time * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+"""
+Benchmark suite for the rendering, selection and storage hot paths and
+for cold starts.
+
+Run from the project root:
+    python benchmarks/bench_suite.py [--quick] [--suites render storage ...]
+        [--output results.json] [--baseline baseline.json]
+
+Sweeps entry counts, canvas sizes and label lengths and records the best
+and median time plus peak memory of every case to a JSON file. With
+--baseline the run is compared case by case against an earlier results
+file and the exit status is 1 if any case got slower than --threshold.
+
+Everything runs headlessly on PIL and the storage modules, without a Tk
+mainloop. The "startup" suite times whole cold-started processes: a CLI
+spin (python main.py spin) and the GUI's imports. The "tk" suite (off by
+default) times GUI startup and WheelWidget.draw_wheel on a real canvas and
+needs a display, e.g. run it under xvfb-run.
+
+Each case runs in a fresh subprocess so peak RSS (above the memory used by
+its setup) is measured per case; --in-process skips that. Peak RSS needs
+the resource module (not available on Windows).
+"""
+import argparse
+import atexit
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+ENTRY_COUNTS = [10, 100, 1000, 10000, 100000]
+CANVAS_SIZES = [400, 800]
+LABEL_LENGTHS = [8, 64]
+BACKENDS = ["json", "compact", "sqlite"]
+QUICK = {"entries": [10, 1000], "sizes": [400], "labels": [8]}
+DEFAULT_SUITES = ["render", "frames", "selection", "storage", "startup"]
+PALETTE = ["#FF6B6B", "#4ECDC4", "#45B7D1", "#96CEB4", "#FFEEAD", "#D4A5A5", "#9B59B6", "#3498DB"]
+
+
+def make_entries(count, label_len=8, seed=0):
+    rng = random.Random(seed)
+    entries = []
+    for i in range(count):
+        label = f"{i} " + "Option " * (label_len // 7 + 1)
+        entry = {'label': label[:max(label_len, len(str(i)))], 'weight': rng.uniform(0.1, 10.0)}
+        if i % 3 == 0:
+            entry['color'] = "#%06x" % rng.randrange(0x1000000)
+        entries.append(entry)
+    return entries
+
+
+def peak_rss_kib():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, KiB elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+# Cases: each takes its params and returns the function to time. Work done
+# before returning is setup and is not timed.
+
+def case_render(entries, size, label_len, rasterizer="pil"):
+    from wheel_widget import WheelRenderer, np
+    import spin_engine
+    if rasterizer == "numpy" and np is None:
+        raise ImportError("No module named 'numpy'")
+    items = make_entries(entries, label_len)
+    bounds = spin_engine.slice_bounds(items)
+    # The NumPy rasterizer anti-aliases itself instead of supersampling
+    scale = 1 if rasterizer == "numpy" else 2
+    return lambda: WheelRenderer(items, bounds, PALETTE, size, size, scale,
+                                 lod=True, rasterizer=rasterizer).render()
+
+
+def render_images(entries, size, label_len):
+    from wheel_widget import WheelRenderer
+    import spin_engine
+    items = make_entries(entries, label_len)
+    return WheelRenderer(items, spin_engine.slice_bounds(items), PALETTE, size, size, 2).render()
+
+
+def case_frame_fast(entries, size, label_len, frames=60):
+    # Cold rotation cache: every frame is rendered, as on the first spin
+    from wheel_widget import RotationFrameCache
+    _, low, _ = render_images(entries, size, label_len)
+    cache = RotationFrameCache()
+
+    def run():
+        cache.reset(low)
+        for k in range(frames):
+            cache.get(k * 360 / frames + 0.5)
+    return run
+
+
+def case_frame_polar(entries, size, label_len, frames=60):
+    # Texture sampled in setup, as it is once per render in the app
+    from wheel_widget import PolarFrameMap, np
+    if np is None:
+        raise ImportError("No module named 'numpy'")
+    _, low, _ = render_images(entries, size, label_len)
+    polar = PolarFrameMap().for_source(low)
+
+    def run():
+        for k in range(frames):
+            polar.frame(k * 360 / frames + 0.5)
+    return run
+
+
+def case_frame_full(entries, size, label_len):
+    from wheel_widget import static_frame
+    image, _, _ = render_images(entries, size, label_len)
+    return lambda: static_frame(image, 33.3, (size, size))
+
+
+def case_get_winner(entries, draws=100000):
+    import wheel_widget # Imported here so the import is not timed
+    from bench_selection import loop_get_winner
+    items = make_entries(entries)
+    return lambda: loop_get_winner(items, draws)
+
+
+def case_draw(entries, draws=100000):
+    import selection
+    items = make_entries(entries)
+    return lambda: selection.draw(items, draws, seed=0)
+
+
+def temp_data_dir():
+    """
+    Returns a new temporary data directory, deleted when the process exits.
+    """
+    data_dir = tempfile.mkdtemp(prefix="wheel-bench-")
+    atexit.register(shutil.rmtree, data_dir, ignore_errors=True)
+    return data_dir
+
+
+def use_storage(backend):
+    import storage
+    os.environ["WHEEL_DATA_DIR"] = temp_data_dir()
+    storage.set_backend(backend) # Also closes a SQLite store in the previous dir
+    return storage
+
+
+def case_save(backend, entries, label_len):
+    storage = use_storage(backend)
+    items = make_entries(entries, label_len)
+    return lambda: storage.save_config("Bench", items)
+
+
+def case_load(backend, entries, label_len):
+    storage = use_storage(backend)
+    storage.save_config("Bench", make_entries(entries, label_len))
+    return lambda: storage.load_config("Bench")
+
+
+def case_list(backend, entries, configs=20):
+    storage = use_storage(backend)
+    for i in range(configs):
+        storage.save_config(f"Bench {i}", make_entries(entries, seed=i))
+    storage.list_configs() # Warm the metadata index
+    return storage.list_configs
+
+
+def startup_command(args, data_dir):
+    env = dict(os.environ, WHEEL_DATA_DIR=data_dir)
+    command = [sys.executable] + args
+    return lambda: subprocess.run(command, env=env, cwd=ROOT, check=True,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def case_startup_cli(entries):
+    # Cold start of a whole CLI process spinning a saved wheel
+    storage = use_storage("json")
+    storage.save_config("Bench", make_entries(entries))
+    return startup_command(["main.py", "spin", "Bench", "--seed", "0"], storage.get_data_dir())
+
+
+def case_startup_gui_import():
+    # What the GUI pays for imports before it can build a window
+    return startup_command(["-c", "import app"], temp_data_dir())
+
+
+def case_startup_gui(entries):
+    # Until the GUI is interactive with an autosaved wheel; needs a display
+    import tkinter as tk
+    tk.Tk().destroy() # Fails here, in setup, without a display
+    storage = use_storage("json")
+    storage.save_autosave(make_entries(entries))
+    script = "from app import App\napp = App()\nwhile app.autosave is None:\n    app.update()\napp.on_close()"
+    return startup_command(["-c", script], storage.get_data_dir())
+
+
+def case_tk_draw(entries, size, fast, frames=60):
+    import tkinter as tk
+    from wheel_widget import WheelWidget
+    root = tk.Tk()
+    wheel = WheelWidget(root, width=size, height=size)
+    wheel.pack()
+    root.update()
+    wheel.set_entries(make_entries(entries))
+    while not wheel.image_ready():
+        root.update()
+        time.sleep(0.005)
+
+    def run():
+        for k in range(frames):
+            wheel.angle = k * 360 / frames + 0.5
+            wheel.draw_wheel(fast=fast)
+            root.update_idletasks()
+    return run
+
+
+CASES = {
+    "render": case_render,
+    "frame_fast": case_frame_fast,
+    "frame_polar": case_frame_polar,
+    "frame_full": case_frame_full,
+    "get_winner": case_get_winner,
+    "draw": case_draw,
+    "save": case_save,
+    "load": case_load,
+    "list": case_list,
+    "tk_draw": case_tk_draw,
+    "startup_cli": case_startup_cli,
+    "startup_gui_import": case_startup_gui_import,
+    "startup_gui": case_startup_gui,
+}
+
+
+def plan(suites, sweep):
+    """
+    Returns (case, params) pairs for the given suites and sweep values.
+    """
+    jobs = []
+    for name in suites:
+        if name == "render":
+            for n in sweep["entries"]:
+                for size in sweep["sizes"]:
+                    for label_len in sweep["labels"]:
+                        for rasterizer in ("pil", "numpy"):
+                            jobs.append(("render", {"entries": n, "size": size, "label_len": label_len,
+                                                    "rasterizer": rasterizer}))
+        elif name == "frames":
+            for size in sweep["sizes"]:
+                for case in ("frame_fast", "frame_polar", "frame_full"):
+                    jobs.append((case, {"entries": 100, "size": size, "label_len": 8}))
+        elif name == "selection":
+            for n in sweep["entries"]:
+                jobs.append(("get_winner", {"entries": n}))
+                jobs.append(("draw", {"entries": n}))
+        elif name == "storage":
+            for backend in BACKENDS:
+                for n in sweep["entries"]:
+                    for label_len in sweep["labels"]:
+                        jobs.append(("save", {"backend": backend, "entries": n, "label_len": label_len}))
+                        jobs.append(("load", {"backend": backend, "entries": n, "label_len": label_len}))
+                    jobs.append(("list", {"backend": backend, "entries": n}))
+        elif name == "startup":
+            jobs.append(("startup_gui_import", {}))
+            for n in sweep["entries"]:
+                jobs.append(("startup_cli", {"entries": n}))
+        elif name == "tk":
+            for n in sweep["entries"]:
+                jobs.append(("startup_gui", {"entries": n}))
+            for n in sweep["entries"]:
+                for size in sweep["sizes"]:
+                    for fast in (True, False):
+                        jobs.append(("tk_draw", {"entries": n, "size": size, "fast": fast}))
+        else:
+            raise SystemExit(f"Unknown suite: {name}")
+    return jobs
+
+
+def run_case(case, params, repeat):
+    """
+    Runs one case in this process and returns its result record.
+    """
+    record = {"case": case, "params": params}
+    try:
+        run = CASES[case](**params)
+    except ImportError as e:
+        record["skipped"] = str(e)
+        return record
+    base = peak_rss_kib()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    peak = peak_rss_kib()
+    record.update({
+        "best": min(times),
+        "median": statistics.median(times),
+        "repeat": repeat,
+        "peak_rss_kib": None if peak is None else peak - base,
+    })
+    return record
+
+
+def run_isolated(case, params, repeat):
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", json.dumps([case, params]),
+                          "--repeat", str(repeat)], capture_output=True, text=True)
+    if out.returncode != 0:
+        return {"case": case, "params": params, "error": out.stderr.strip().splitlines()[-1:]}
+    return json.loads(out.stdout)
+
+
+def case_key(record):
+    return record["case"] + " " + json.dumps(record["params"], sort_keys=True)
+
+
+def describe(record):
+    params = " ".join(f"{k}={v}" for k, v in record["params"].items())
+    return f"{record['case']:<11} {params}"
+
+
+def compare(results, baseline, threshold):
+    """
+    Prints each case against the baseline and returns the number of
+    cases slower than the baseline by more than threshold.
+    """
+    previous = {case_key(r): r for r in baseline["results"] if "best" in r}
+    regressions = 0
+    print(f"\nAgainst baseline from {baseline['meta']['timestamp']}:")
+    for record in results:
+        old = previous.get(case_key(record))
+        if old is None or "best" not in record:
+            continue
+        change = record["best"] / old["best"] - 1 if old["best"] > 0 else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  SLOWER"
+            regressions += 1
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"  {describe(record):<58} {old['best'] * 1000:9.2f} -> {record['best'] * 1000:9.2f} ms"
+              f" ({change:+.0%}){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--suites", nargs="+", default=DEFAULT_SUITES,
+                        help="render, frames, selection, storage, startup, tk")
+    parser.add_argument("--entries", type=int, nargs="+", default=ENTRY_COUNTS)
+    parser.add_argument("--sizes", type=int, nargs="+", default=CANVAS_SIZES, help="square canvas sizes")
+    parser.add_argument("--labels", type=int, nargs="+", default=LABEL_LENGTHS, help="label lengths")
+    parser.add_argument("--quick", action="store_true", help="small sweep for a fast check")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="results JSON file to write")
+    parser.add_argument("--baseline", help="earlier results JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative slowdown that counts as a regression")
+    parser.add_argument("--in-process", action="store_true", help="run all cases in this process")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        case, params = json.loads(args.child)
+        print(json.dumps(run_case(case, params, args.repeat)))
+        return 0
+
+    sweep = dict(QUICK) if args.quick else {"entries": args.entries, "sizes": args.sizes, "labels": args.labels}
+    results = []
+    for case, params in plan(args.suites, sweep):
+        record = run_case(case, params, args.repeat) if args.in_process else run_isolated(case, params, args.repeat)
+        results.append(record)
+        if "best" in record:
+            peak = record["peak_rss_kib"]
+            memory = "" if peak is None else f" {peak / 1024:8.1f} MiB"
+            print(f"  {describe(record):<58} {record['best'] * 1000:9.2f} ms{memory}", flush=True)
+        else:
+            print(f"  {describe(record):<58} {record.get('skipped') or record.get('error')}", flush=True)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sweep": sweep,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Measures load time and peak RSS for JSON vs the compact .wheel format.
+
+Run from the project root:
+    python benchmarks/bench_wheel_format.py [--entries 1000000]
+
+Each load runs in a fresh subprocess so peak RSS is not shared between
+measurements. Peak RSS needs the resource module (not available on Windows).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import wheel_format
+from bench_selection import make_entries
+
+# Runs in the child: load one file and report time and peak RSS (KiB)
+CHILD = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+import wheel_format
+path, fmt = sys.argv[1], sys.argv[2]
+base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+if fmt == "json":
+    with open(path, 'r') as f:
+        data = json.load(f)
+elif fmt != "none":
+    with open(path, 'rb') as f:
+        data = wheel_format.load(f)
+elapsed = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"seconds": elapsed, "peak_kib": peak, "base_kib": base}}))
+"""
+
+
+FILES = {
+    "json": "wheel.json",
+    "wheel (raw)": "raw.wheel",
+    "wheel (gzip)": "gzip.wheel",
+}
+
+
+def measure(path, fmt):
+    out = subprocess.run([sys.executable, "-c", CHILD.format(root=ROOT), path, fmt],
+                         check=True, capture_output=True, text=True).stdout
+    return json.loads(out)
+
+
+def generate(directory, count):
+    """
+    Writes the test files and prints save times. Runs in its own process so
+    the parent (whose peak RSS the load children inherit) stays small.
+    """
+    entries = make_entries(count)
+    for i, entry in enumerate(entries):
+        if i % 3 == 0:
+            entry['color'] = "#%06x" % (i * 2654435761 % 0xFFFFFF)
+
+    save_times = {}
+    start = time.perf_counter()
+    with open(os.path.join(directory, FILES["json"]), 'w') as f:
+        json.dump({"name": "Bench", "entries": entries}, f, indent=4)
+    save_times["json"] = time.perf_counter() - start
+
+    for fmt, compress in (("wheel (raw)", False), ("wheel (gzip)", True)):
+        start = time.perf_counter()
+        with open(os.path.join(directory, FILES[fmt]), 'wb') as f:
+            wheel_format.dump(f, "Bench", entries, compress=compress)
+        save_times[fmt] = time.perf_counter() - start
+    print(json.dumps(save_times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=1000000)
+    parser.add_argument("--generate", metavar="DIR", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.generate:
+        generate(args.generate, args.entries)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--entries", str(args.entries), "--generate", tmp],
+                             check=True, capture_output=True, text=True).stdout
+        save_times = json.loads(out)
+
+        baseline = measure(os.path.join(tmp, FILES["json"]), "none")["peak_kib"]
+        print(f"{args.entries} entries (interpreter baseline {baseline / 1024:.1f} MiB)")
+        for fmt, filename in FILES.items():
+            path = os.path.join(tmp, filename)
+            result = measure(path, "json" if fmt == "json" else "wheel")
+            print(f"  {fmt:<13} size {os.path.getsize(path) / 1e6:8.1f} MB  "
+                  f"save {save_times[fmt] * 1000:8.1f} ms  load {result['seconds'] * 1000:8.1f} ms  "
+                  f"peak RSS +{(result['peak_kib'] - baseline) / 1024:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Command line interface for saved wheels, run through main.py.
+
+Only imports storage and spin_engine. Spins are simulated exactly like
+the GUI spins them, so `spin --seed S` gives the winners that spinning the
+wheel with the same seeds would.
+"""
+import argparse
+import json
+import random
+import sys
+import storage
+import spin_engine
+from entry_table import EntryTable
+
+def cmd_spin(args):
+    data = storage.load_config(args.config)
+    if data is None:
+        raise FileNotFoundError(f"No saved configuration named '{args.config}'")
+    entries = EntryTable.coerce(data.get('entries', []))
+    bounds = spin_engine.slice_bounds(entries)
+    if bounds[-1] <= 0:
+        raise ValueError(f"'{args.config}' has no entry with a positive weight")
+    if args.n < 1:
+        raise ValueError("--n must be at least 1")
+    # Pick the seed here so it can be printed and the spins replayed
+    seed = args.seed if args.seed is not None else random.getrandbits(64)
+    winners, angle = spin_engine.simulate(bounds, args.n, seed=seed)
+    labels = entries.labels
+    if args.json:
+        json.dump({"config": data.get('name', args.config), "seed": seed, "spins": args.n,
+                   "winners": [labels[i] for i in winners], "final_angle": angle}, sys.stdout)
+        sys.stdout.write("\n")
+    else:
+        sys.stdout.write("".join(labels[i] + "\n" for i in winners))
+        print(f"seed: {seed}", file=sys.stderr)
+
+def cmd_list(args):
+    infos = storage.list_config_info()
+    if args.json:
+        json.dump([{"name": m["name"], "entries": m["entries"], "total_weight": m["total_weight"]}
+                   for m in infos], sys.stdout)
+        sys.stdout.write("\n")
+        return
+    for meta in infos:
+        print(f"{meta['name']}\t{meta['entries']} entries\ttotal weight {meta['total_weight']:g}")
+
+def cmd_export(args):
+    storage.export_config(args.config, args.path)
+
+def cmd_import(args):
+    print(storage.import_config(args.path, args.name))
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py", description="Random Wheel Spinner. "
+                                     "Run without arguments to start the GUI.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    spin = commands.add_parser("spin", help="spin a saved wheel and print the winners")
+    spin.add_argument("config", help="name of the saved configuration")
+    spin.add_argument("--n", type=int, default=1, help="number of spins, each starting where the last stopped")
+    spin.add_argument("--seed", type=int, help="seed to replay the spins from (printed to stderr)")
+    spin.add_argument("--json", action="store_true", help="print a JSON object instead of one winner per line")
+    spin.set_defaults(run=cmd_spin)
+
+    listing = commands.add_parser("list", help="list saved configurations")
+    listing.add_argument("--json", action="store_true")
+    listing.set_defaults(run=cmd_list)
+
+    export = commands.add_parser("export", help="write a saved wheel to a JSON file")
+    export.add_argument("config")
+    export.add_argument("path")
+    export.set_defaults(run=cmd_export)
+
+    imports = commands.add_parser("import", help="save a JSON or .wheel file as a configuration")
+    imports.add_argument("path")
+    imports.add_argument("--name", help="name to save it under (default: the name in the file)")
+    imports.set_defaults(run=cmd_import)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        args.run(args)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,166 @@
+import math
+import tkinter as tk
+import customtkinter as ctk
+
+class EntryList(ctk.CTkFrame):
+    """
+    Scrollable list of wheel entries that only creates widgets for the rows
+    in view (plus a small overscan) and recycles them while scrolling.
+
+    The list shows the entries list it was given and never modifies it.
+    After changing that list, call insert/update_row/remove for single-row
+    changes or set_entries to replace it.
+    """
+    def __init__(self, master, on_edit, on_delete, label_text="Entries", row_height=34, overscan=2, **kwargs):
+        super().__init__(master, **kwargs)
+        self.on_edit = on_edit
+        self.on_delete = on_delete
+        self.row_height = row_height
+        self.overscan = overscan
+
+        self.entries = []
+        self.offset = 0 # Scroll position in pixels
+        self.rows = [] # Pool of recycled row widgets
+        self.row_index = [] # Entry index shown by each pooled row, or None
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        self.header = ctk.CTkLabel(self, text=label_text)
+        self.header.grid(row=0, column=0, columnspan=2, padx=5, pady=(5, 0), sticky="ew")
+
+        self.viewport = ctk.CTkFrame(self, fg_color="transparent")
+        self.viewport.grid(row=1, column=0, padx=(5, 0), pady=5, sticky="nsew")
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.yview)
+        self.scrollbar.grid(row=1, column=1, padx=(0, 5), pady=5, sticky="ns")
+
+        self.viewport.bind("<Configure>", lambda e: self.refresh())
+
+        # Mouse wheel scrolling while the pointer is over the list. Bound
+        # globally (added to, not replacing, other widgets' handlers) since
+        # <Leave> fires on the viewport as soon as the pointer enters a row.
+        self.bind_all("<MouseWheel>", self.on_mousewheel, add="+")
+        self.bind_all("<Button-4>", lambda e: self.on_mousewheel(e, -1), add="+")
+        self.bind_all("<Button-5>", lambda e: self.on_mousewheel(e, 1), add="+")
+
+    def set_entries(self, entries):
+        self.entries = entries
+        self.offset = 0
+        self.refresh(force=True)
+
+    def insert(self, index):
+        """
+        Call after inserting entries[index].
+        """
+        self.refresh(force=True, first_changed=index)
+
+    def update_row(self, index):
+        """
+        Call after replacing entries[index].
+        """
+        for row, shown in zip(self.rows, self.row_index):
+            if shown == index:
+                self.fill_row(row, index)
+
+    def remove(self, index):
+        """
+        Call after deleting entries[index].
+        """
+        self.refresh(force=True, first_changed=index)
+
+    def view_height(self):
+        return max(self.viewport.winfo_height(), 1)
+
+    def max_offset(self):
+        return max(0, len(self.entries) * self.row_height - self.view_height())
+
+    def yview(self, *args):
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.offset = float(args[1]) * len(self.entries) * self.row_height
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            step = self.view_height() if args[2] == "pages" else self.row_height
+            self.offset += amount * step
+        self.refresh()
+
+    def pointer_over_list(self, event):
+        """
+        True if the pointer is over the viewport or any of its rows.
+        """
+        try:
+            widget = self.winfo_containing(event.x_root, event.y_root)
+        except (KeyError, tk.TclError):
+            return False # Pointer over a popup or a widget being destroyed
+        while widget is not None:
+            if widget is self.viewport:
+                return True
+            widget = widget.master
+        return False
+
+    def on_mousewheel(self, event, units=None):
+        if not self.winfo_exists() or not self.pointer_over_list(event):
+            return
+        if units is None:
+            # Windows reports multiples of 120, macOS small deltas
+            units = -int(event.delta / 120) if abs(event.delta) >= 120 else -event.delta
+        self.yview("scroll", units, "units")
+
+    def refresh(self, force=False, first_changed=0):
+        """
+        Lays out the pooled rows for the current scroll position. Rows whose
+        entry index did not change keep their content unless force is set,
+        in which case rows at or after first_changed are refilled.
+        """
+        self.offset = min(max(self.offset, 0), self.max_offset())
+        height = self.view_height()
+
+        first = int(self.offset // self.row_height)
+        count = min(math.ceil(height / self.row_height) + 1 + self.overscan, len(self.entries) - first)
+        count = max(count, 0)
+
+        while len(self.rows) < count:
+            self.rows.append(self.make_row(len(self.rows)))
+            self.row_index.append(None)
+
+        for slot, row in enumerate(self.rows):
+            index = first + slot
+            if slot >= count:
+                if self.row_index[slot] is not None:
+                    row.place_forget()
+                    self.row_index[slot] = None
+                continue
+            if self.row_index[slot] != index or (force and index >= first_changed):
+                self.fill_row(row, index)
+                self.row_index[slot] = index
+            row.place(x=0, y=index * self.row_height - self.offset, relwidth=1.0, height=self.row_height)
+
+        # Update scrollbar
+        total = len(self.entries) * self.row_height
+        if total <= height:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + height) / total)
+
+    def make_row(self, slot):
+        row = ctk.CTkFrame(self.viewport, fg_color="transparent")
+
+        row.lbl = ctk.CTkLabel(row, text="", anchor="w")
+        row.lbl.pack(side="left", fill="x", expand=True)
+
+        # Buttons look up the entry shown by this slot when clicked
+        btn_del = ctk.CTkButton(row, text="X", width=30, fg_color="#FF5555", hover_color="#CC0000",
+                                command=lambda: self.on_delete(self.row_index[slot]))
+        btn_del.pack(side="right", padx=(2, 0))
+
+        btn_edit = ctk.CTkButton(row, text="✎", width=30, fg_color="#3B8ED0", hover_color="#1F6AA5",
+                                 command=lambda: self.on_edit(self.row_index[slot]))
+        btn_edit.pack(side="right", padx=(0, 2))
+
+        return row
+
+    def fill_row(self, row, index):
+        entry = self.entries[index]
+        row.lbl.configure(text=f"{entry['label']} (x{entry['weight']:g})")
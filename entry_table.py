@@ -0,0 +1,190 @@
+import sys
+from array import array
+from collections.abc import MutableSequence
+from itertools import accumulate
+
+# Packed color codes, shared with wheel_format: 0 for no color,
+# COLOR_RGB | 0xRRGGBB for '#rrggbb' and COLOR_EXTRA | i for any other
+# color string, i indexing a list of extra colors.
+COLOR_RGB = 0x01000000
+COLOR_EXTRA = 0x02000000
+
+def hex_color_code(color):
+    """
+    Returns COLOR_RGB | 0xRRGGBB for a '#rrggbb' color, else None.
+    """
+    if len(color) == 7 and color[0] == "#":
+        try:
+            return COLOR_RGB | int(color[1:], 16)
+        except ValueError:
+            pass
+    return None
+
+def decode_color(code, extra_colors):
+    if code & COLOR_RGB:
+        return "#%06x" % (code & 0xFFFFFF)
+    if code & COLOR_EXTRA:
+        return extra_colors[code & 0xFFFFFF]
+    return None
+
+class EntryTable(MutableSequence):
+    """
+    Compact, column-oriented list of wheel entries.
+
+    Labels are kept as interned strings, weights in an array('d') and colors
+    as packed codes in an array('I'): 0 for no color, COLOR_RGB | 0xRRGGBB
+    for '#rrggbb' colors and COLOR_EXTRA | i for any other color string,
+    i indexing extra_colors (the codes above, also used by wheel_format).
+
+    Indexing and iterating yield plain dicts ({'label', 'weight'[, 'color']}),
+    and assigning/inserting accepts them, so code written against a list of
+    entry dicts keeps working. Hot paths should use the columns and
+    label()/weight()/color() directly. The total weight and cumulative
+    weights are cached until the next change.
+    """
+    def __init__(self, entries=()):
+        self.labels = []
+        self.weights = array('d')
+        self.colors = array('I')
+        self.extra_colors = []
+        self._extra_index = {}
+        self._cumulative = None
+        if isinstance(entries, EntryTable):
+            self.labels = list(entries.labels)
+            self.weights = array('d', entries.weights)
+            self.colors = array('I', entries.colors)
+            self.extra_colors = list(entries.extra_colors)
+            self._extra_index = dict(entries._extra_index)
+        else:
+            for entry in entries:
+                self.append(entry)
+
+    @classmethod
+    def coerce(cls, entries):
+        """
+        Returns entries itself if it already is an EntryTable, else a new one.
+        """
+        return entries if isinstance(entries, cls) else cls(entries)
+
+    def copy(self):
+        return EntryTable(self)
+
+    def encode_color(self, color):
+        if not color:
+            return 0
+        code = hex_color_code(color)
+        if code is not None:
+            return code
+        index = self._extra_index.get(color)
+        if index is None:
+            index = len(self.extra_colors)
+            self.extra_colors.append(color)
+            self._extra_index[color] = index
+        return COLOR_EXTRA | index
+
+    def decode_color(self, code):
+        return decode_color(code, self.extra_colors)
+
+    # Column accessors
+
+    def label(self, index):
+        return self.labels[index]
+
+    def weight(self, index):
+        return self.weights[index]
+
+    def color(self, index):
+        return self.decode_color(self.colors[index])
+
+    def total_weight(self):
+        cumulative = self.cumulative()
+        return cumulative[-1]
+
+    def cumulative(self):
+        """
+        Returns prefix sums of the weights: len(self) + 1 values from 0.
+        """
+        if self._cumulative is None:
+            self._cumulative = array('d', accumulate(self.weights, initial=0.0))
+        return self._cumulative
+
+    def add(self, label, weight, color=None):
+        """
+        Appends one entry without going through a dict.
+        """
+        self.labels.append(sys.intern(label))
+        self.weights.append(float(weight))
+        self.colors.append(self.encode_color(color))
+        self._cumulative = None
+
+    def extend_columns(self, labels, weights, colors):
+        """
+        Appends columns in bulk. colors must already be codes of this table.
+        """
+        self.labels.extend(sys.intern(label) for label in labels)
+        self.weights.extend(weights)
+        self.colors.extend(colors)
+        self._cumulative = None
+
+    def to_list(self):
+        return list(self)
+
+    # MutableSequence protocol
+
+    def __len__(self):
+        return len(self.labels)
+
+    def _entry(self, index):
+        entry = {'label': self.labels[index], 'weight': self.weights[index]}
+        color = self.decode_color(self.colors[index])
+        if color is not None:
+            entry['color'] = color
+        return entry
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            table = EntryTable()
+            table.labels = self.labels[index]
+            table.weights = self.weights[index]
+            table.colors = self.colors[index]
+            table.extra_colors = list(self.extra_colors)
+            table._extra_index = dict(self._extra_index)
+            return table
+        return self._entry(index)
+
+    def __iter__(self):
+        decode = self.decode_color
+        for label, weight, code in zip(self.labels, self.weights, self.colors):
+            entry = {'label': label, 'weight': weight}
+            if code:
+                entry['color'] = decode(code)
+            yield entry
+
+    def __setitem__(self, index, entry):
+        if isinstance(index, slice):
+            raise TypeError("EntryTable does not support slice assignment")
+        self.labels[index] = sys.intern(entry['label'])
+        self.weights[index] = float(entry['weight'])
+        self.colors[index] = self.encode_color(entry.get('color'))
+        self._cumulative = None
+
+    def __delitem__(self, index):
+        del self.labels[index]
+        del self.weights[index]
+        del self.colors[index]
+        self._cumulative = None
+
+    def insert(self, index, entry):
+        appending = index >= len(self.labels)
+        weight = float(entry['weight'])
+        self.labels.insert(index, sys.intern(entry['label']))
+        self.weights.insert(index, weight)
+        self.colors.insert(index, self.encode_color(entry.get('color')))
+        if appending and self._cumulative is not None:
+            # Appends keep the prefix sums valid
+            self._cumulative.append(self._cumulative[-1] + weight)
+        else:
+            self._cumulative = None
+
+    def __repr__(self):
+        return f"EntryTable({len(self)} entries)"
@@ -0,0 +1,235 @@
+"""
+Opt-in timing instrumentation.
+
+Set WHEEL_PROFILE=1 (or call set_enabled(True), bound to F12 in the app)
+to record how long each named stage takes. Every stage keeps its last
+samples in a ring buffer for percentiles and histograms. Spans also go
+into a bounded trace buffer that can be written as Chrome trace JSON
+(chrome://tracing, Perfetto). When disabled, span() and timed() cost one
+flag check.
+
+STARTUP is always on: the app marks its startup milestones there and logs
+them to startup.log in the data dir on every launch.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+_enabled = os.environ.get("WHEEL_PROFILE", "") not in ("", "0")
+_NULL = nullcontext()
+
+class StageStats:
+    """
+    Ring buffer of the last capacity durations (seconds) of one stage.
+    """
+    def __init__(self, capacity=1000):
+        self.samples = deque(maxlen=capacity)
+        self.count = 0 # All samples ever, not just the buffered ones
+        self.total = 0.0
+        self.lock = threading.Lock() # Render workers record stages too
+
+    def add(self, seconds):
+        with self.lock:
+            self.samples.append(seconds)
+            self.count += 1
+            self.total += seconds
+
+    def snapshot(self):
+        """
+        Returns a list copy of the buffered samples, safe while others add.
+        """
+        with self.lock:
+            return list(self.samples)
+
+    def last(self):
+        return self.samples[-1] if self.samples else 0.0
+
+    def percentile(self, p, samples=None):
+        ordered = sorted(self.snapshot() if samples is None else samples)
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+    def histogram(self, bounds_ms=(1, 2, 4, 8, 16, 33, 66, 133)):
+        """
+        Returns sample counts per bucket: <= each bound in ms, then above the last.
+        """
+        counts = [0] * (len(bounds_ms) + 1)
+        for seconds in self.snapshot():
+            ms = seconds * 1000
+            for i, bound in enumerate(bounds_ms):
+                if ms <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+        return counts
+
+    def summary(self):
+        with self.lock:
+            samples = list(self.samples)
+            count = self.count
+        return {
+            "count": count,
+            "mean_ms": 1000 * sum(samples) / len(samples) if samples else 0.0,
+            "p50_ms": 1000 * self.percentile(50, samples),
+            "p95_ms": 1000 * self.percentile(95, samples),
+            "max_ms": 1000 * max(samples, default=0.0),
+        }
+
+class Profiler:
+    """
+    Collects per-stage timings and trace events from any thread.
+    """
+    def __init__(self, capacity=1000, trace_capacity=100000):
+        self.capacity = capacity
+        self.stages = {}
+        self.events = deque(maxlen=trace_capacity) # (name, start, seconds, thread id)
+        self.origin = time.perf_counter()
+        self.session_start = self.origin
+        self.lock = threading.Lock()
+
+    def stage(self, name):
+        stats = self.stages.get(name)
+        if stats is None:
+            with self.lock:
+                stats = self.stages.setdefault(name, StageStats(self.capacity))
+        return stats
+
+    def record(self, name, start, seconds):
+        self.stage(name).add(seconds)
+        self.events.append((name, start, seconds, threading.get_ident()))
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter() - start)
+
+    def begin_session(self):
+        """
+        Marks the start of a session (e.g. a spin); trace dumps start here.
+        """
+        self.session_start = time.perf_counter()
+
+    def reset(self):
+        with self.lock:
+            self.stages.clear()
+            self.events.clear()
+        self.session_start = time.perf_counter()
+
+    def report(self):
+        """
+        Returns a text table of all stages with their latency histograms.
+        """
+        lines = [f"{'stage':<20} {'count':>7} {'mean':>8} {'p50':>8} {'p95':>8} {'max':>8}  "
+                 "<=1 <=2 <=4 <=8 <=16 <=33 <=66 <=133 >133 ms"]
+        for name in sorted(self.stages):
+            stats = self.stages[name]
+            s = stats.summary()
+            buckets = " ".join(str(c) for c in stats.histogram())
+            lines.append(f"{name:<20} {s['count']:>7} {s['mean_ms']:>8.2f} {s['p50_ms']:>8.2f} "
+                         f"{s['p95_ms']:>8.2f} {s['max_ms']:>8.2f}  {buckets}")
+        return "\n".join(lines)
+
+    def chrome_trace(self, session_only=True):
+        """
+        Returns the buffered spans in Chrome trace event format.
+        """
+        since = self.session_start if session_only else 0.0
+        pid = os.getpid()
+        events = [{"name": name, "ph": "X", "pid": pid, "tid": tid,
+                   "ts": (start - self.origin) * 1e6, "dur": seconds * 1e6}
+                  for name, start, seconds, tid in list(self.events) if start >= since]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump(self, directory, prefix="wheel-profile"):
+        """
+        Writes <prefix>.txt (report) and <prefix>.trace.json (session
+        trace) into directory, creating it if needed, and returns their paths.
+        """
+        os.makedirs(directory, exist_ok=True)
+        report_path = os.path.join(directory, prefix + ".txt")
+        trace_path = os.path.join(directory, prefix + ".trace.json")
+        with open(report_path, 'w') as f:
+            f.write(self.report() + "\n")
+        with open(trace_path, 'w') as f:
+            json.dump(self.chrome_trace(), f)
+        return report_path, trace_path
+
+class StartupTimeline:
+    """
+    Milestones of one app start (e.g. import, window, first_paint,
+    interactive) in seconds since origin, which main.py sets before its
+    other imports. While profiling, each step is also recorded as a
+    "startup.<milestone>" span.
+    """
+    def __init__(self, origin=None):
+        self.origin = time.perf_counter() if origin is None else origin
+        self.marks = [] # (name, seconds since origin)
+
+    def mark(self, name):
+        now = time.perf_counter()
+        previous = self.origin + self.marks[-1][1] if self.marks else self.origin
+        self.marks.append((name, now - self.origin))
+        if _enabled:
+            PROFILER.record("startup." + name, previous, now - previous)
+
+    def summary(self):
+        return " ".join(f"{name}={seconds * 1000:.0f}ms" for name, seconds in self.marks)
+
+    def log(self, directory, filename="startup.log", keep=200):
+        """
+        Appends the timeline as one line to directory/filename, keeping the
+        last keep lines, so startup regressions show up over time.
+        """
+        path = os.path.join(directory, filename)
+        line = time.strftime("%Y-%m-%dT%H:%M:%S") + " " + self.summary() + "\n"
+        try:
+            with open(path, 'r') as f:
+                lines = f.readlines()[-(keep - 1):]
+        except OSError:
+            lines = []
+        try:
+            with open(path, 'w') as f:
+                f.writelines(lines + [line])
+        except OSError:
+            pass
+        if _enabled:
+            print("startup:", self.summary())
+
+PROFILER = Profiler()
+STARTUP = StartupTimeline()
+
+def enabled():
+    return _enabled
+
+def set_enabled(flag):
+    global _enabled
+    _enabled = bool(flag)
+
+def span(name):
+    """
+    Context manager timing a stage, or a no-op when disabled.
+    """
+    return PROFILER.span(name) if _enabled else _NULL
+
+def timed(name):
+    """
+    Decorator timing every call of a function as stage name.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with PROFILER.span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
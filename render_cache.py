@@ -0,0 +1,298 @@
+"""
+Persistent cache of rendered wheel images and saved-config thumbnails.
+
+Images are PNG files in <data dir>/render_cache named after a content hash
+of everything that affects their pixels (entries, size, scale and render
+settings), so an unchanged wheel is never rendered twice, across runs too.
+Reading a file marks it as recently used; once the files exceed
+budget_bytes the least recently used ones are deleted.
+
+Thumbnails are rendered by a process pool (see ThumbnailService). A small
+index maps each config name to the metadata it had when its thumbnail was
+made, so configs are only reloaded and re-hashed when they changed.
+"""
+import hashlib
+import json
+import math
+import os
+import queue
+import traceback
+from PIL import Image
+import spin_engine
+import storage
+
+RENDER_VERSION = 1 # Bump when a renderer change alters the pixels
+CACHE_DIR_NAME = "render_cache"
+THUMB_INDEX_NAME = "thumbnails.json"
+THUMBNAIL_SIZE = 48
+THUMBNAIL_MARGIN = 20 # WheelRenderer leaves this much room for the pointer
+
+def get_cache_dir():
+    return os.path.join(storage.get_data_dir(), CACHE_DIR_NAME)
+
+def render_key(renderer, kind="wheel"):
+    """
+    Returns the content hash of what renderer (a WheelRenderer) would draw.
+    """
+    entries = renderer.entries
+    digest = hashlib.sha256()
+    settings = (RENDER_VERSION, kind, renderer.width, renderer.height, renderer.scale, renderer.lod,
+                renderer.rasterizer, renderer.min_slice_px, renderer.band_px, renderer.outline_min_px,
+                renderer.label_min_ratio, tuple(renderer.colors), tuple(entries.extra_colors), len(entries))
+    digest.update(repr(settings).encode())
+    digest.update("\x1f".join(entries.labels).encode("utf-8", "surrogatepass"))
+    digest.update(entries.weights.tobytes())
+    digest.update(entries.colors.tobytes())
+    return digest.hexdigest()
+
+class RenderCache:
+    """
+    Size-bounded LRU directory of PNG images keyed by render_key. Safe to
+    share between processes: writes are atomic, and every failure just
+    counts as a miss.
+    """
+    def __init__(self, directory, budget_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.budget_bytes = budget_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".png")
+
+    def contains(self, key):
+        return os.path.exists(self.path(key))
+
+    def get(self, key):
+        """
+        Returns the cached image for key, or None.
+        """
+        path = self.path(key)
+        try:
+            with Image.open(path) as image:
+                image.load()
+            os.utime(path) # Most recently used
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return image
+
+    def put(self, key, image):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with storage.atomic_write(self.path(key), 'wb') as f:
+                image.save(f, "PNG", compress_level=1)
+            self.evict()
+        except OSError:
+            traceback.print_exc()
+
+    def evict(self):
+        """
+        Deletes the least recently used images beyond budget_bytes (never
+        the most recent one).
+        """
+        files = []
+        with os.scandir(self.directory) as it:
+            for item in it:
+                if item.name.endswith(".png") and item.is_file():
+                    stat = item.stat()
+                    files.append((stat.st_mtime_ns, stat.st_size, item.path))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files[:-1]:
+            if total <= self.budget_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass # Already evicted by another process
+            total -= size
+
+    def load_render(self, renderer):
+        """
+        Returns (image, image_low, signatures) like renderer.render() from
+        the cache, or None.
+        """
+        key = render_key(renderer)
+        image = self.get(key)
+        if image is None:
+            return None
+        w, h, cx, cy, r = renderer.render_geometry()
+        if image.size != (w, h) or image.mode != "RGBA":
+            return None
+        if image.size == (renderer.width, renderer.height):
+            low = image
+        else:
+            # Stored too: downscaling costs about as much as decoding
+            low = self.get(key + "-low")
+            if low is None or low.size != (renderer.width, renderer.height):
+                return None
+        return image, low, renderer.slice_signatures()
+
+    def store_render(self, renderer, image, image_low=None):
+        """
+        Stores a render; image_low is only needed when it is a downscaled copy.
+        """
+        key = render_key(renderer)
+        if image_low is not None and image_low is not image:
+            self.put(key + "-low", image_low)
+        self.put(key, image)
+
+def thumbnail_renderer(entries, colors, size=THUMBNAIL_SIZE):
+    """
+    Returns a WheelRenderer for a size x size thumbnail (plus margin),
+    without labels or thin outlines.
+    """
+    from wheel_widget import WheelRenderer, np
+    rasterizer = "numpy" if np is not None and len(entries) >= 200 else "pil"
+    side = size + 2 * THUMBNAIL_MARGIN
+    renderer = WheelRenderer(entries, spin_engine.slice_bounds(entries), colors, side, side,
+                             1 if rasterizer == "numpy" else 2, lod=True, rasterizer=rasterizer)
+    renderer.label_min_ratio = math.inf
+    renderer.outline_min_px = 4.0
+    return renderer
+
+def make_thumbnail(name, backend, cache_dir, colors, size=THUMBNAIL_SIZE):
+    """
+    Process pool job: makes sure the thumbnail of saved config name for its
+    current contents is cached. Returns (name, key), with key None when the
+    config is missing or empty.
+    """
+    storage.set_backend(backend)
+    data = storage.load_config(name)
+    entries = data.get('entries') if data else None
+    if not entries:
+        return name, None
+    renderer = thumbnail_renderer(entries, colors, size)
+    key = render_key(renderer, "thumbnail")
+    cache = RenderCache(cache_dir)
+    if not cache.contains(key):
+        _, low, _ = renderer.render()
+        m = THUMBNAIL_MARGIN
+        cache.put(key, low.crop((m, m, m + size, m + size)))
+    return name, key
+
+class ThumbnailService:
+    """
+    Keeps config thumbnails up to date off the calling thread.
+
+    request(infos) takes list_config_info() records and returns the
+    thumbnails that are still valid; the rest are submitted to a process
+    pool, and poll() returns them as they finish. Only configs whose
+    metadata changed since their thumbnail was made are reloaded, and only
+    those whose content hash changed are rendered again.
+    """
+    stamp_fields = ("size", "mtime_ns", "modified", "entries", "total_weight")
+
+    def __init__(self, cache, colors, size=THUMBNAIL_SIZE, max_workers=2):
+        self.cache = cache
+        self.colors = list(colors)
+        self.size = size
+        self.max_workers = max_workers
+        self.pool = None
+        self.pending = {} # name -> (future, stamp)
+        self.done = queue.Queue()
+        self.index_path = os.path.join(cache.directory, THUMB_INDEX_NAME)
+        self.index = self.load_index()
+
+    def load_index(self):
+        try:
+            with open(self.index_path, 'r') as f:
+                index = json.load(f)
+            return index if isinstance(index, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def save_index(self):
+        try:
+            os.makedirs(self.cache.directory, exist_ok=True)
+            storage.write_json_atomic(self.index_path, self.index)
+        except OSError:
+            traceback.print_exc()
+
+    def stamp(self, meta):
+        return [meta.get(field) for field in self.stamp_fields]
+
+    def executor(self):
+        if self.pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # Spawned, not forked: the parent runs Tk and worker threads
+            self.pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                            mp_context=multiprocessing.get_context("spawn"))
+        return self.pool
+
+    def request(self, infos):
+        """
+        Returns {name: image} of the thumbnails that are up to date and
+        queues the others.
+        """
+        ready = {}
+        names = set()
+        for meta in infos:
+            name = meta["name"]
+            names.add(name)
+            stamp = self.stamp(meta)
+            record = self.index.get(name)
+            if record and record.get("stamp") == stamp:
+                if record.get("key") is None:
+                    continue # Empty wheel, nothing to show
+                image = self.cache.get(record["key"])
+                if image is not None:
+                    ready[name] = image
+                    continue
+            pending = self.pending.get(name)
+            if pending and pending[1] == stamp:
+                continue
+            future = self.executor().submit(make_thumbnail, name, storage.BACKEND, self.cache.directory,
+                                             self.colors, self.size)
+            self.pending[name] = (future, stamp)
+            future.add_done_callback(lambda f, name=name: self.done.put(name))
+
+        # Forget deleted and renamed configs
+        stale = [name for name in self.index if name not in names]
+        for name in stale:
+            del self.index[name]
+        if stale:
+            self.save_index()
+        return ready
+
+    def busy(self):
+        return bool(self.pending)
+
+    def poll(self):
+        """
+        Returns {name: image} of thumbnails finished since the last call.
+        """
+        finished = {}
+        changed = False
+        while True:
+            try:
+                name = self.done.get_nowait()
+            except queue.Empty:
+                break
+            pending = self.pending.get(name)
+            if pending is None or not pending[0].done():
+                continue
+            future, stamp = self.pending.pop(name)
+            try:
+                _, key = future.result()
+            except Exception:
+                traceback.print_exc()
+                continue
+            self.index[name] = {"stamp": stamp, "key": key}
+            changed = True
+            if key is not None:
+                image = self.cache.get(key)
+                if image is not None:
+                    finished[name] = image
+        if changed:
+            self.save_index()
+        return finished
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+        self.pending.clear()
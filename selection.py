@@ -0,0 +1,154 @@
+import heapq
+import random
+from entry_table import EntryTable
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAX_DRAW = 1_000_000 # Largest batch selection.draw accepts (the draw dialog's limit)
+
+
+class WeightedSampler:
+    """
+    Draws weighted winners from a list of entries without touching the GUI.
+
+    Entries use the same format as storage.save_config:
+    [{'label': 'Option 1', 'weight': 1, 'color': '#FF0000'}, ...]
+    or an EntryTable, whose weight column is used as is.
+
+    Draws with replacement use a Walker/Vose alias table, so each winner
+    costs O(1) after an O(n) setup. NumPy is used when available to draw
+    whole batches at once; results for a given seed are reproducible per
+    backend.
+    """
+
+    def __init__(self, entries, use_numpy=True):
+        self.entries = entries
+        if isinstance(entries, EntryTable):
+            self.weights = entries.weights[:]
+        else:
+            self.weights = [float(e['weight']) for e in entries]
+        if any(w < 0 for w in self.weights):
+            raise ValueError("Weights must not be negative")
+        self.total_weight = sum(self.weights)
+        if not entries or self.total_weight <= 0:
+            raise ValueError("Need at least one entry with a positive weight")
+        self.use_numpy = use_numpy and np is not None
+        self.prob, self.alias = build_alias_table(self.weights)
+        if self.use_numpy:
+            self._np_weights = np.asarray(self.weights, dtype=np.float64)
+            self._np_prob = np.asarray(self.prob, dtype=np.float64)
+            self._np_alias = np.asarray(self.alias, dtype=np.int64)
+
+    def sample_indices(self, n, seed=None, replace=True):
+        """
+        Returns a list of n entry indices.
+        """
+        if n < 0:
+            raise ValueError("n must not be negative")
+        if not replace:
+            available = sum(1 for w in self.weights if w > 0)
+            if n > available:
+                raise ValueError(f"Cannot draw {n} unique winners from {available} entries")
+
+        if self.use_numpy:
+            rng = np.random.default_rng(seed)
+            if replace:
+                return self._np_alias_sample(n, rng).tolist()
+            return self._np_sample_unique(n, rng).tolist()
+
+        rng = random.Random(seed)
+        if replace:
+            return self._alias_sample(n, rng)
+        return self._sample_unique(n, rng)
+
+    def draw(self, n, seed=None, replace=True):
+        """
+        Returns a list of n winning entries.
+        """
+        entries = self.entries
+        return [entries[i] for i in self.sample_indices(n, seed=seed, replace=replace)]
+
+    def _alias_sample(self, n, rng):
+        k = len(self.prob)
+        prob = self.prob
+        alias = self.alias
+        rand = rng.random
+        result = []
+        append = result.append
+        for _ in range(n):
+            u = rand() * k
+            i = int(u)
+            if i >= k: # Guard against float rounding at the top end
+                i = k - 1
+            append(i if u - i < prob[i] else alias[i])
+        return result
+
+    def _np_alias_sample(self, n, rng):
+        k = len(self._np_prob)
+        columns = rng.integers(0, k, size=n)
+        coins = rng.random(n)
+        return np.where(coins < self._np_prob[columns], columns, self._np_alias[columns])
+
+    def _sample_unique(self, n, rng):
+        # Efraimidis-Spirakis: keep the n largest keys u ** (1 / w), compared
+        # in log space as log(u) / w = -E / w with E ~ Exp(1). The plain
+        # power underflows to 0 for small weights and ties break by index.
+        expovariate = rng.expovariate
+        keys = ((-expovariate(1.0) / w, i) for i, w in enumerate(self.weights) if w > 0)
+        return [i for _, i in heapq.nlargest(n, keys)]
+
+    def _np_sample_unique(self, n, rng):
+        # Same scheme in log space: log(u) / w, largest first
+        with np.errstate(divide='ignore'):
+            keys = np.log(rng.random(len(self._np_weights))) / self._np_weights
+        if n == 0:
+            return np.empty(0, dtype=np.int64)
+        top = np.argpartition(-keys, n - 1)[:n]
+        return top[np.argsort(-keys[top], kind='stable')]
+
+
+def build_alias_table(weights):
+    """
+    Builds Vose's alias table for the given non-negative weights.
+    Returns (prob, alias) lists of the same length as weights.
+    """
+    k = len(weights)
+    total = sum(weights)
+    scaled = [w * k / total for w in weights]
+    prob = [0.0] * k
+    alias = list(range(k))
+
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+    while small and large:
+        s = small.pop()
+        l = large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] = (scaled[l] + scaled[s]) - 1.0
+        if scaled[l] < 1.0:
+            small.append(l)
+        else:
+            large.append(l)
+
+    # Whatever is left is 1.0 up to rounding error
+    for i in large:
+        prob[i] = 1.0
+    for i in small:
+        prob[i] = 1.0
+
+    return prob, alias
+
+
+def draw(entries, n, seed=None, replace=True, limit=MAX_DRAW):
+    """
+    Convenience wrapper: draws n winners from entries in one batch. Raises
+    ValueError if n is above limit.
+    """
+    if n > limit:
+        raise ValueError(f"Cannot draw more than {limit:,} winners at once")
+    return WeightedSampler(entries).draw(n, seed=seed, replace=replace)
@@ -0,0 +1,142 @@
+import random
+from bisect import bisect_right
+from entry_table import EntryTable
+
+MIN_DURATION = 3.0
+MAX_DURATION = 5.0
+MIN_ROTATION = 720.0 # At least 2 full spins
+MAX_ROTATION = 1440.0 # Up to 4
+
+_MASK = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+
+
+class Spin:
+    """
+    One planned spin of the wheel, independent of Tk and the clock.
+
+    Everything is decided up front from the seed: duration (seconds),
+    total_rotation (degrees) and so the final angle. angle_at(t) gives the
+    eased angle t seconds into the spin in O(1), so a spin can be animated
+    at any frame rate, simulated without a display or replayed exactly
+    from (seed, start_angle).
+    """
+
+    def __init__(self, seed, start_angle, duration, total_rotation):
+        self.seed = seed
+        self.start_angle = start_angle
+        self.duration = duration
+        self.total_rotation = total_rotation
+
+    @property
+    def final_angle(self):
+        return (self.start_angle + self.total_rotation) % 360
+
+    def progress(self, elapsed):
+        """
+        Returns the eased fraction (0..1) of the rotation done after elapsed seconds.
+        """
+        if elapsed >= self.duration:
+            return 1.0
+        if elapsed <= 0:
+            return 0.0
+        # Ease out cubic
+        t = elapsed / self.duration
+        return 1 - (1 - t) ** 3
+
+    def angle_at(self, elapsed):
+        return (self.start_angle + self.total_rotation * self.progress(elapsed)) % 360
+
+    def finished(self, elapsed):
+        return elapsed >= self.duration
+
+    def winner_index(self, slice_bounds):
+        return index_at_angle(slice_bounds, self.final_angle)
+
+    def __repr__(self):
+        return (f"Spin(seed={self.seed}, start_angle={self.start_angle}, "
+                f"duration={self.duration:.3f}, total_rotation={self.total_rotation:.3f})")
+
+
+def plan_spin(start_angle=0.0, seed=None):
+    """
+    Plans a spin from start_angle. Without a seed a fresh one is picked, so
+    every spin can be replayed from its seed.
+    """
+    if seed is None:
+        seed = random.getrandbits(64)
+    # Even and odd inputs, so no two spins of a seed sequence share a draw
+    duration = MIN_DURATION + (MAX_DURATION - MIN_DURATION) * _uniform(2 * seed)
+    total_rotation = MIN_ROTATION + (MAX_ROTATION - MIN_ROTATION) * _uniform(2 * seed + 1)
+    return Spin(seed, start_angle, duration, total_rotation)
+
+
+def _uniform(x):
+    # SplitMix64 finalizer mapped to [0, 1). Much cheaper than seeding a
+    # random.Random per spin, and identical on every platform.
+    z = x & _MASK
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK
+    z ^= z >> 31
+    return (z >> 11) * (1.0 / (1 << 53))
+
+
+def slice_bounds(entries):
+    """
+    Returns the cumulative slice angles of entries (an EntryTable or a
+    list of entry dicts): len(entries) + 1 values from 0 to 360, all 0 when
+    no entry has a positive weight. This is the one layout every
+    angle -> entry lookup, render and cache key uses.
+    """
+    cumulative = EntryTable.coerce(entries).cumulative()
+    total = cumulative[-1]
+    if total <= 0:
+        return [0.0] * len(cumulative)
+    scale = 360 / total
+    return [w * scale for w in cumulative]
+
+def index_at_angle(slice_bounds, angle):
+    """
+    Returns the index of the slice containing angle, given cumulative slice
+    angles (len(slices) + 1 values from 0 to 360), or None without slices.
+    """
+    count = len(slice_bounds) - 1
+    if count <= 0:
+        return None
+    # Zero-weight slices share their start with the next slice, so taking
+    # the last bound <= angle always lands on a non-empty slice.
+    index = bisect_right(slice_bounds, angle % 360) - 1
+    return min(max(index, 0), count - 1)
+
+
+def simulate(slice_bounds, n, seed=None, start_angle=0.0):
+    """
+    Runs n spins back to back, each starting where the previous one
+    stopped, and returns (winner indices, final angle). Gives the same
+    results as chaining plan_spin over spin_seeds(n, seed), without
+    building Spin objects.
+    """
+    lo, span = MIN_ROTATION, MAX_ROTATION - MIN_ROTATION
+    uniform = _uniform
+    count = len(slice_bounds) - 1
+    angle = start_angle
+    winners = []
+    append = winners.append
+    for spin_seed in spin_seeds(n, seed):
+        angle = (angle + (lo + span * uniform(2 * spin_seed + 1))) % 360
+        if count > 0:
+            index = bisect_right(slice_bounds, angle) - 1
+            append(min(max(index, 0), count - 1))
+        else:
+            append(None)
+    return winners, angle
+
+
+def spin_seeds(n, seed=None):
+    """
+    Returns the seeds of n consecutive spins derived from seed, as used by
+    simulate. Any one of them can be replayed with plan_spin.
+    """
+    if seed is None:
+        seed = random.getrandbits(64)
+    return [(seed + i * _GOLDEN) & _MASK for i in range(n)]
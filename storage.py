@@ -2,86 +2,584 @@ import os
 import json
 import appdirs
 import shutil
+import tempfile
+import threading
+import time
+import traceback
+import atexit
+from contextlib import contextmanager
+import wheel_format
+import instrument
+from entry_table import EntryTable
 
 APP_NAME = "RandomWheelSpinner"
 APP_AUTHOR = "User"
 AUTOSAVE_NAME = "_autosave"
+INDEX_NAME = "_configs.index" # Metadata manifest, not a .json so it never lists as a config
+SQLITE_NAME = "wheels.sqlite3"
+
+# "json" stores one JSON file per wheel, "compact" one binary .wheel file per
+# wheel (see wheel_format) and "sqlite" a single database file in the data
+# dir. The autosave is always JSON.
+BACKEND = os.environ.get("WHEEL_STORAGE_BACKEND", "json")
+_sqlite_store = None
 
 def get_data_dir():
-    data_dir = appdirs.user_data_dir(APP_NAME, APP_AUTHOR)
+    # WHEEL_DATA_DIR overrides the per-user folder, e.g. for benchmarks
+    data_dir = os.environ.get("WHEEL_DATA_DIR") or appdirs.user_data_dir(APP_NAME, APP_AUTHOR)
     if not os.path.exists(data_dir):
         os.makedirs(data_dir)
     return data_dir
 
+def config_ext():
+    return ".wheel" if BACKEND == "compact" else ".json"
+
 def get_config_path(name):
     if name == AUTOSAVE_NAME:
         return os.path.join(get_data_dir(), f"{AUTOSAVE_NAME}.json")
     safe_name = "".join([c for c in name if c.isalpha() or c.isdigit() or c in (' ', '-', '_')]).strip()
-    return os.path.join(get_data_dir(), f"{safe_name}.json")
+    return os.path.join(get_data_dir(), f"{safe_name}{config_ext()}")
+
+def set_backend(backend):
+    global BACKEND, _sqlite_store
+    if backend not in ("json", "compact", "sqlite"):
+        raise ValueError(f"Unknown storage backend: {backend}")
+    if _sqlite_store is not None:
+        _sqlite_store.close()
+        _sqlite_store = None
+    BACKEND = backend
+
+def sqlite_store():
+    """
+    Returns the SQLite store when that backend is active, else None.
+    """
+    global _sqlite_store
+    if BACKEND != "sqlite":
+        return None
+    if _sqlite_store is None:
+        import storage_sqlite
+        _sqlite_store = storage_sqlite.SQLiteStore(os.path.join(get_data_dir(), SQLITE_NAME))
+    return _sqlite_store
 
+@instrument.timed("storage.save")
 def save_config(name, entries):
     """
-    Entries is a list of dicts: [{'label': 'Option 1', 'weight': 1, 'color': '#FF0000'}, ...]
+    Entries is an EntryTable or a list of dicts: [{'label': 'Option 1', 'weight': 1, 'color': '#FF0000'}, ...]
     """
+    store = sqlite_store() if name != AUTOSAVE_NAME else None
+    if store:
+        store.save_config(name, entries)
+        return
     path = get_config_path(name)
     data = {
         "name": name,
         "entries": entries
     }
-    with open(path, 'w') as f:
-        json.dump(data, f, indent=4)
+    if path.endswith(".wheel"):
+        with atomic_write(path, 'wb') as f:
+            wheel_format.dump(f, name, entries)
+    else:
+        with open(path, 'w') as f:
+            json.dump(dict(data, entries=list(entries)), f, indent=4)
+    if name != AUTOSAVE_NAME:
+        update_index(path, data)
 
+@instrument.timed("storage.load")
 def load_config(name):
+    store = sqlite_store() if name != AUTOSAVE_NAME else None
+    if store:
+        return store.load_config(name)
     path = get_config_path(name)
     if not os.path.exists(path):
         return None
-    with open(path, 'r') as f:
-        return json.load(f)
+    return read_config_file(path)
+
+def read_config_file(path):
+    """
+    Reads a JSON or .wheel config file into {'name': ..., 'entries': EntryTable}.
+    """
+    with open(path, 'rb') as f:
+        if wheel_format.is_wheel_file(f):
+            return wheel_format.load(f)
+        data = json.load(f)
+    if not isinstance(data, dict) or not isinstance(data.get('entries', []), list):
+        raise ValueError(f"Not a wheel configuration: {path}")
+    try:
+        data['entries'] = EntryTable(data.get('entries', []))
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid entry in {path}: {e!r}") from e
+    return data
+
+def export_config(name, path):
+    """
+    Writes a saved wheel to path as (indented) JSON, whatever the backend.
+    """
+    data = load_config(name)
+    if data is None:
+        raise FileNotFoundError(f"No saved configuration named '{name}'")
+    with open(path, 'w') as f:
+        json.dump({"name": data.get("name", name), "entries": list(data.get("entries", []))}, f, indent=4)
+
+def import_config(path, name=None):
+    """
+    Saves a JSON (or .wheel) file as a configuration in the current backend.
+    Returns the name it was saved under.
+    """
+    data = read_config_file(path)
+    if name is None:
+        name = data.get("name") or os.path.splitext(os.path.basename(path))[0]
+    save_config(name, data.get("entries", []))
+    return name
+
+@contextmanager
+def atomic_write(path, mode='w'):
+    """
+    Opens a temp file next to path for writing; on success it is fsynced and
+    renamed over path, so a crash never leaves a half-written file.
+    """
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, mode) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def write_text_atomic(path, text):
+    with atomic_write(path) as f:
+        f.write(text)
+
+def write_json_atomic(path, data):
+    write_text_atomic(path, json.dumps(data, separators=(',', ':')))
+
+# The autosave is a base snapshot (_autosave.json) plus an append-only
+# journal of operations made since (_autosave.journal). The journal's first
+# line names the snapshot generation it applies to, so a journal left over
+# from before a compaction is never replayed twice.
 
-def save_autosave(entries):
-    save_config(AUTOSAVE_NAME, entries)
+def get_journal_path():
+    return os.path.join(get_data_dir(), f"{AUTOSAVE_NAME}.journal")
+
+def encode_record(record):
+    return json.dumps(record, separators=(',', ':')) + "\n"
+
+def apply_op(entries, op):
+    """
+    Applies one journal operation to entries in place.
+    """
+    kind = op["op"]
+    if kind == "add":
+        entries.insert(op["i"], op["e"])
+    elif kind == "edit":
+        entries[op["i"]] = op["e"]
+    elif kind == "remove":
+        del entries[op["i"]]
+    elif kind == "move":
+        entries.insert(op["to"], entries.pop(op["i"]))
+    else:
+        raise ValueError(f"Unknown journal operation: {kind}")
+
+def save_autosave(entries, generation=0):
+    """
+    Writes a new base snapshot and starts an empty journal for it.
+    """
+    write_json_atomic(get_config_path(AUTOSAVE_NAME), {
+        "name": AUTOSAVE_NAME,
+        "generation": generation,
+        "entries": list(entries)
+    })
+    write_text_atomic(get_journal_path(), encode_record({"generation": generation}))
+
+def append_autosave_journal(ops):
+    with open(get_journal_path(), 'a') as f:
+        f.write("".join(encode_record(op) for op in ops))
+        f.flush()
+        os.fsync(f.fileno())
+
+def load_autosave_state():
+    """
+    Returns (entries, generation, journal_ops): the snapshot with its journal
+    replayed. Replay stops at the first unreadable record, so a torn final
+    write only loses that record. An unreadable snapshot is reported and
+    moved aside (to _autosave.json.corrupt), and the state starts empty.
+    """
+    try:
+        data = load_config(AUTOSAVE_NAME) # Always JSON, whatever the backend
+    except (OSError, ValueError):
+        traceback.print_exc()
+        path = get_config_path(AUTOSAVE_NAME)
+        try:
+            os.replace(path, path + ".corrupt")
+        except OSError:
+            pass
+        data = None
+    if not data:
+        return EntryTable(), 0, 0
+    entries = data['entries']
+    generation = data.get('generation', 0)
+
+    replayed = 0
+    try:
+        with open(get_journal_path(), 'r') as f:
+            lines = iter(f)
+            header = json.loads(next(lines))
+            if header.get("generation") == generation:
+                for line in lines:
+                    apply_op(entries, json.loads(line))
+                    replayed += 1
+    except (OSError, StopIteration, ValueError, KeyError, IndexError, TypeError):
+        pass
+    return entries, generation, replayed
 
 def load_autosave():
-    data = load_config(AUTOSAVE_NAME)
-    if data:
-        return data.get('entries', [])
-    return []
+    return load_autosave_state()[0]
+
+class AutosaveService:
+    """
+    Write-behind autosave journal. add/edit/remove/move record single
+    operations and reset replaces the whole list; all return immediately.
+    A background thread appends queued operations to the journal once no
+    change has come in for debounce seconds, and compacts everything into a
+    new snapshot once the journal holds more than compact_threshold
+    operations. flush() writes synchronously, close() flushes and stops the
+    thread (also done at interpreter exit).
+
+    The service keeps its own copy of the entries (loaded from disk on
+    start), which is what gets written on compaction.
+
+    Counters: flushes is the number of writes done, pending_writes the
+    number of changes waiting to be written, coalesced the total number of
+    changes that were folded into a later write, compactions the number of
+    snapshots written.
+    """
+    def __init__(self, debounce=1.0, compact_threshold=1000):
+        self.debounce = debounce
+        self.compact_threshold = compact_threshold
+        self.cond = threading.Condition()
+        self.write_lock = threading.Lock()
+
+        self.entries, self.generation, self.journal_ops = load_autosave_state()
+        self.pending_ops = []
+        # First write of a session is a snapshot, which also drops any torn
+        # tail left in the journal by a crash.
+        self.compact_needed = True
+
+        self.dirty = False
+        self.closed = False
+        self.last_mark = 0.0
+        self.flushes = 0
+        self.pending_writes = 0
+        self.coalesced = 0
+        self.compactions = 0
+        self.errors = 0
+
+        self.thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def add(self, index, entry):
+        self._record({"op": "add", "i": index, "e": entry})
+
+    def edit(self, index, entry):
+        self._record({"op": "edit", "i": index, "e": entry})
+
+    def remove(self, index):
+        self._record({"op": "remove", "i": index})
+
+    def move(self, index, to):
+        self._record({"op": "move", "i": index, "to": to})
+
+    def reset(self, entries):
+        with self.cond:
+            self.entries = EntryTable(entries)
+            self.pending_ops = []
+            self.compact_needed = True
+            self._mark()
+
+    def _record(self, op):
+        with self.cond:
+            apply_op(self.entries, op)
+            self.pending_ops.append(op)
+            self._mark()
+
+    def _mark(self):
+        if self.dirty:
+            self.coalesced += 1
+        self.dirty = True
+        self.pending_writes += 1
+        self.last_mark = time.monotonic()
+        self.cond.notify()
+
+    def flush(self):
+        self._write_pending()
+
+    def close(self):
+        with self.cond:
+            if self.closed:
+                return
+            self.closed = True
+            self.cond.notify()
+        self.thread.join()
+        self._write_pending()
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.dirty and not self.closed:
+                    self.cond.wait()
+                if self.closed and not self.dirty:
+                    return
+                delay = self.last_mark + self.debounce - time.monotonic()
+                if delay > 0 and not self.closed:
+                    self.cond.wait(delay)
+                    continue
+            self._write_pending()
+
+    def _write_pending(self):
+        with self.write_lock:
+            with self.cond:
+                if not self.dirty:
+                    return
+                ops = self.pending_ops
+                self.pending_ops = []
+                compact = self.compact_needed or self.journal_ops + len(ops) > self.compact_threshold
+                if compact:
+                    snapshot = self.entries.copy()
+                    self.generation += 1
+                    generation = self.generation
+                    self.compact_needed = False
+                    self.journal_ops = 0
+                else:
+                    self.journal_ops += len(ops)
+                self.dirty = False
+                self.pending_writes = 0
+            try:
+                if compact:
+                    save_autosave(snapshot, generation)
+                    self.compactions += 1
+                else:
+                    append_autosave_journal(ops)
+                self.flushes += 1
+            except OSError:
+                self.errors += 1
+                traceback.print_exc()
+                with self.cond:
+                    # The journal may be incomplete now; rewrite it all next time
+                    self.compact_needed = True
+                    self.dirty = True
+                    self.last_mark = time.monotonic() # Retry after another debounce
+
+def is_config_filename(filename, ext=None):
+    # Profile traces written by older versions also ended up in the data dir
+    return (filename.endswith(ext or config_ext()) and filename != f"{AUTOSAVE_NAME}.json"
+            and not filename.startswith(".tmp-") and not filename.endswith(".trace.json"))
+
+def load_index():
+    try:
+        with open(os.path.join(get_data_dir(), INDEX_NAME), 'r') as f:
+            index = json.load(f)
+        return index if isinstance(index, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_index(index):
+    write_json_atomic(os.path.join(get_data_dir(), INDEX_NAME), index)
+
+def describe_config(filename, stat, data):
+    """
+    Builds the index record for a config file from its parsed contents.
+    """
+    if not isinstance(data, dict):
+        data = {}
+    entries = data.get("entries") or []
+    if isinstance(entries, EntryTable):
+        return index_record(stat, data.get("name", os.path.splitext(filename)[0]), len(entries), entries.total_weight())
+    try:
+        total_weight = sum((float(e.get('weight', 0)) for e in entries), 0.0)
+    except (AttributeError, TypeError, ValueError):
+        total_weight = 0.0
+    name = data.get("name", os.path.splitext(filename)[0])
+    return index_record(stat, name, len(entries), total_weight)
+
+def index_record(stat, name, count, total_weight):
+    return {
+        "name": name,
+        "entries": count,
+        "total_weight": total_weight,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns
+    }
+
+def scan_config_file(path, stat):
+    """
+    Builds the index record for a config file by reading it. .wheel files
+    are streamed, so no entry list is built.
+    """
+    filename = os.path.basename(path)
+    try:
+        with open(path, 'rb') as f:
+            if wheel_format.is_wheel_file(f):
+                name, count, total_weight = wheel_format.summarize(f)
+                return index_record(stat, name, count, total_weight)
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = None
+    return describe_config(filename, stat, data)
+
+def update_index(path, data):
+    """
+    Records (or, with data=None, drops) the index record for path.
+    """
+    filename = os.path.basename(path)
+    index = load_index()
+    if data is None:
+        index.pop(filename, None)
+    else:
+        index[filename] = describe_config(filename, os.stat(path), data)
+    save_index(index)
+
+@instrument.timed("storage.list")
+def list_config_info():
+    """
+    Returns a metadata record (at least name, entries and total_weight) for
+    every saved config.
+    """
+    store = sqlite_store()
+    if store:
+        return store.list_config_info()
+    return list_file_config_info()
+
+def list_file_config_info(ext=None):
+    """
+    Returns index records (name, entries, total_weight, size, mtime_ns and
+    filename) for every config file with the given extension (default: the
+    current backend's). Only files whose size or mtime changed since they
+    were indexed are parsed.
+    """
+    index = load_index()
+    fresh = {}
+    changed = False
+    with os.scandir(get_data_dir()) as it:
+        for item in it:
+            if not is_config_filename(item.name, ext) or not item.is_file():
+                continue
+            stat = item.stat()
+            meta = index.get(item.name)
+            if not meta or meta.get("mtime_ns") != stat.st_mtime_ns or meta.get("size") != stat.st_size:
+                meta = scan_config_file(item.path, stat)
+                changed = True
+            fresh[item.name] = meta
+
+    # Keep records of other formats' files; they are revalidated when listed
+    for filename, meta in index.items():
+        if not is_config_filename(filename, ext):
+            fresh.setdefault(filename, meta)
+    if changed or len(fresh) != len(index):
+        save_index(fresh)
+    return [dict(meta, filename=filename) for filename, meta in fresh.items()
+            if is_config_filename(filename, ext)]
 
 def list_configs():
-    data_dir = get_data_dir()
-    configs = []
-    for filename in os.listdir(data_dir):
-        if filename.endswith(".json") and filename != f"{AUTOSAVE_NAME}.json":
-            # We could read the file to get the real name, or just use the filename
-            # Let's try to read the 'name' field from json, fallback to filename
+    return [meta["name"] for meta in list_config_info()]
+
+def load_entries(name, limit=None, offset=0):
+    """
+    Returns a slice of a saved wheel's entries, or None if it does not exist.
+    Only the SQLite backend avoids reading the whole wheel.
+    """
+    store = sqlite_store()
+    if store:
+        return store.load_entries(name, limit=limit, offset=offset)
+    data = load_config(name)
+    if data is None:
+        return None
+    entries = data.get('entries', [])
+    return entries[offset:] if limit is None else entries[offset:offset + limit]
+
+def config_stats(name):
+    """
+    Returns (entry_count, total_weight) of a saved wheel, or None.
+    """
+    store = sqlite_store()
+    if store:
+        return store.config_stats(name)
+    for meta in list_config_info():
+        if meta["name"] == name:
+            return meta["entries"], meta["total_weight"]
+    return None
+
+def migrate_json_to_sqlite():
+    """
+    Copies every JSON config into the SQLite database (the JSON files are
+    left in place). Returns the number of wheels migrated.
+    """
+    import storage_sqlite
+    store = storage_sqlite.SQLiteStore(os.path.join(get_data_dir(), SQLITE_NAME))
+    count = 0
+    try:
+        for meta in list_file_config_info(".json"):
             try:
-                with open(os.path.join(data_dir, filename), 'r') as f:
-                    data = json.load(f)
-                    configs.append(data.get("name", filename[:-5]))
-            except:
-                configs.append(filename[:-5])
-    return configs
+                data = read_config_file(os.path.join(get_data_dir(), meta["filename"]))
+            except (OSError, ValueError):
+                continue
+            store.save_config(data.get("name", meta["name"]), data.get("entries", []))
+            count += 1
+    finally:
+        store.close()
+    return count
+
+def migrate_json_to_compact():
+    """
+    Writes a .wheel copy of every JSON config that has none yet (the JSON
+    files are left in place). The compact backend only lists .wheel files.
+    Returns the number of wheels migrated.
+    """
+    data_dir = get_data_dir()
+    count = 0
+    for meta in list_file_config_info(".json"):
+        path = os.path.join(data_dir, os.path.splitext(meta["filename"])[0] + ".wheel")
+        if os.path.exists(path):
+            continue
+        try:
+            data = read_config_file(os.path.join(data_dir, meta["filename"]))
+        except (OSError, ValueError):
+            continue
+        name = data.get("name", meta["name"])
+        with atomic_write(path, 'wb') as f:
+            wheel_format.dump(f, name, data["entries"])
+        update_index(path, {"name": name, "entries": data["entries"]})
+        count += 1
+    return count
 
 def delete_config(name):
+    store = sqlite_store()
+    if store:
+        store.delete_config(name)
+        return
     path = get_config_path(name)
     if os.path.exists(path):
         os.remove(path)
+        update_index(path, None)
 
 def rename_config(old_name, new_name):
+    store = sqlite_store()
+    if store:
+        store.rename_config(old_name, new_name)
+        return
     old_path = get_config_path(old_name)
     new_path = get_config_path(new_name)
     
     if os.path.exists(old_path):
-        # Load data to update the internal name
-        with open(old_path, 'r') as f:
-            data = json.load(f)
-        
-        data['name'] = new_name
-        
-        # Save to new path
-        with open(new_path, 'w') as f:
-            json.dump(data, f, indent=4)
+        # Load data to update the internal name, then save to new path
+        data = read_config_file(old_path)
+        save_config(new_name, data.get('entries', []))
             
         # Remove old file if paths are different (case sensitivity might matter on some OS, but usually fine on Windows to just write then delete)
         if old_path != new_path:
             os.remove(old_path)
+            update_index(old_path, None)
@@ -0,0 +1,108 @@
+import sqlite3
+import time
+from entry_table import EntryTable
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS wheels (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    entry_count INTEGER NOT NULL,
+    total_weight REAL NOT NULL,
+    modified REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    wheel_id INTEGER NOT NULL REFERENCES wheels(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    label TEXT NOT NULL,
+    weight REAL NOT NULL,
+    color TEXT,
+    PRIMARY KEY (wheel_id, position)
+) WITHOUT ROWID;
+"""
+
+class SQLiteStore:
+    """
+    Single-file SQLite backend for saved wheels. Mirrors the storage module
+    API (save_config, load_config, list_configs, rename_config,
+    delete_config) and adds partial loads. Every call is one transaction.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _wheel_id(self, name):
+        row = self.conn.execute("SELECT id FROM wheels WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def save_config(self, name, entries):
+        entries = EntryTable.coerce(entries)
+        total_weight = entries.total_weight()
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO wheels (name, entry_count, total_weight, modified) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET entry_count = excluded.entry_count, "
+                "total_weight = excluded.total_weight, modified = excluded.modified",
+                (name, len(entries), total_weight, time.time()))
+            wheel_id = self._wheel_id(name)
+            self.conn.execute("DELETE FROM entries WHERE wheel_id = ?", (wheel_id,))
+            self.conn.executemany(
+                "INSERT INTO entries (wheel_id, position, label, weight, color) VALUES (?, ?, ?, ?, ?)",
+                ((wheel_id, i, entries.label(i), entries.weight(i), entries.color(i)) for i in range(len(entries))))
+
+    def load_entries(self, name, limit=None, offset=0):
+        """
+        Returns entries of the wheel in order as an EntryTable, optionally
+        only a slice of them.
+        """
+        wheel_id = self._wheel_id(name)
+        if wheel_id is None:
+            return None
+        rows = self.conn.execute(
+            "SELECT label, weight, color FROM entries WHERE wheel_id = ? ORDER BY position LIMIT ? OFFSET ?",
+            (wheel_id, -1 if limit is None else limit, offset))
+        entries = EntryTable()
+        for label, weight, color in rows:
+            entries.add(label, weight, color)
+        return entries
+
+    def load_config(self, name):
+        entries = self.load_entries(name)
+        if entries is None:
+            return None
+        return {"name": name, "entries": entries}
+
+    def config_stats(self, name):
+        """
+        Returns (entry_count, total_weight) without loading any entries.
+        """
+        return self.conn.execute(
+            "SELECT entry_count, total_weight FROM wheels WHERE name = ?", (name,)).fetchone()
+
+    def list_config_info(self):
+        rows = self.conn.execute("SELECT name, entry_count, total_weight, modified FROM wheels ORDER BY name")
+        return [{"name": name, "entries": count, "total_weight": total, "modified": modified}
+                for name, count, total, modified in rows]
+
+    def list_configs(self):
+        return [row[0] for row in self.conn.execute("SELECT name FROM wheels ORDER BY name")]
+
+    def rename_config(self, old_name, new_name):
+        with self.conn:
+            wheel_id = self._wheel_id(old_name)
+            if wheel_id is None:
+                return # Like the JSON backend, renaming a missing wheel does nothing
+            if old_name != new_name:
+                # Same overwrite semantics as the JSON backend
+                self.conn.execute("DELETE FROM wheels WHERE name = ?", (new_name,))
+            self.conn.execute("UPDATE wheels SET name = ?, modified = ? WHERE id = ?",
+                              (new_name, time.time(), wheel_id))
+
+    def delete_config(self, name):
+        with self.conn:
+            self.conn.execute("DELETE FROM wheels WHERE name = ?", (name,))
@@ -0,0 +1,72 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entry_table import EntryTable, COLOR_RGB, COLOR_EXTRA, hex_color_code, decode_color
+
+ENTRIES = [{'label': 'A', 'weight': 1.0},
+           {'label': 'B', 'weight': 2.0, 'color': '#ff8800'},
+           {'label': 'C', 'weight': 3.0, 'color': 'blue'},
+           {'label': 'D', 'weight': 4.0, 'color': 'blue'}]
+
+
+class ColorCodeTest(unittest.TestCase):
+    def test_hex_codes(self):
+        self.assertEqual(hex_color_code('#FF8800'), COLOR_RGB | 0xFF8800)
+        self.assertEqual(decode_color(COLOR_RGB | 0xFF8800, []), '#ff8800')
+        for color in ('blue', '#fff', '#GGGGGG', '#ff88001'):
+            self.assertIsNone(hex_color_code(color))
+
+    def test_extra_codes(self):
+        self.assertEqual(decode_color(COLOR_EXTRA | 1, ['red', 'blue']), 'blue')
+        self.assertIsNone(decode_color(0, []))
+
+
+class EntryTableTest(unittest.TestCase):
+    def test_round_trip(self):
+        table = EntryTable(ENTRIES)
+        self.assertEqual(list(table), ENTRIES)
+        self.assertEqual([table[i] for i in range(len(table))], ENTRIES)
+        self.assertEqual(table.extra_colors, ['blue']) # Named colors are stored once
+        self.assertEqual(table[1], {'label': 'B', 'weight': 2.0, 'color': '#ff8800'})
+        self.assertEqual(EntryTable([{'label': 'X', 'weight': 1, 'color': '#FF8800'}])[0]['color'], '#ff8800')
+
+    def test_cumulative_follows_changes(self):
+        table = EntryTable(ENTRIES)
+        self.assertEqual(list(table.cumulative()), [0.0, 1.0, 3.0, 6.0, 10.0])
+        table.append({'label': 'E', 'weight': 5})
+        self.assertEqual(table.total_weight(), 15.0)
+        table[0] = {'label': 'A', 'weight': 10}
+        self.assertEqual(table.total_weight(), 24.0)
+        del table[1]
+        table.insert(0, {'label': 'Z', 'weight': 0.5})
+        self.assertEqual(list(table.cumulative()), [0.0, 0.5, 10.5, 13.5, 17.5, 22.5])
+        table.add('F', 1)
+        table.extend_columns(['G'], [2.0], [0])
+        self.assertEqual(table.total_weight(), 25.5)
+
+    def test_copy_and_slice_are_independent(self):
+        table = EntryTable(ENTRIES)
+        copy = table.copy()
+        part = table[2:]
+        copy[0] = {'label': 'X', 'weight': 9, 'color': 'green'}
+        part.append({'label': 'Y', 'weight': 1, 'color': 'red'})
+        self.assertEqual(list(table), ENTRIES)
+        self.assertEqual(table.extra_colors, ['blue'])
+        self.assertEqual(list(part)[:2], ENTRIES[2:])
+        self.assertEqual(part[2]['color'], 'red')
+
+    def test_coerce(self):
+        table = EntryTable(ENTRIES)
+        self.assertIs(EntryTable.coerce(table), table)
+        self.assertEqual(list(EntryTable.coerce(ENTRIES)), ENTRIES)
+
+    def test_rejects_slice_assignment(self):
+        with self.assertRaises(TypeError):
+            EntryTable(ENTRIES)[0:1] = []
+
+
+if __name__ == "__main__":
+    unittest.main()
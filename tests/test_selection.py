@@ -0,0 +1,57 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import selection
+
+ENTRIES = [{'label': 'A', 'weight': 1.0}, {'label': 'B', 'weight': 3.0}]
+
+
+class DrawLimitTest(unittest.TestCase):
+    def test_draw_at_limit(self):
+        winners = selection.draw(ENTRIES, selection.MAX_DRAW, seed=0)
+        self.assertEqual(len(winners), selection.MAX_DRAW)
+
+    def test_draw_above_limit(self):
+        with self.assertRaises(ValueError):
+            selection.draw(ENTRIES, selection.MAX_DRAW + 1, seed=0)
+
+    def test_custom_limit(self):
+        self.assertEqual(len(selection.draw(ENTRIES, 3, seed=0, limit=3)), 3)
+        with self.assertRaises(ValueError):
+            selection.draw(ENTRIES, 4, seed=0, limit=3)
+
+
+class UniqueDrawDistributionTest(unittest.TestCase):
+    draws = 4000
+
+    def first_pick_share(self, weights, use_numpy):
+        entries = [{'label': str(i), 'weight': w} for i, w in enumerate(weights)]
+        sampler = selection.WeightedSampler(entries, use_numpy=use_numpy)
+        firsts = [sampler.sample_indices(1, seed=seed, replace=False)[0] for seed in range(self.draws)]
+        return firsts.count(0) / self.draws
+
+    def check_backend(self, use_numpy):
+        # Tiny weights must not underflow into ties broken by index
+        for weights in ([1.0, 3.0], [0.0001, 0.0003], [1e-300, 3e-300]):
+            with self.subTest(weights=weights):
+                self.assertAlmostEqual(self.first_pick_share(weights, use_numpy), 0.25, delta=0.03)
+
+    def test_python_backend(self):
+        self.check_backend(False)
+
+    @unittest.skipIf(selection.np is None, "NumPy not installed")
+    def test_numpy_backend(self):
+        self.check_backend(True)
+
+    def test_unique_draw_returns_all_positive(self):
+        entries = [{'label': str(i), 'weight': w} for i, w in enumerate([0.0, 1e-6, 2.0, 5.0])]
+        for use_numpy in (False, selection.np is not None):
+            winners = selection.WeightedSampler(entries, use_numpy=use_numpy).sample_indices(3, seed=1, replace=False)
+            self.assertEqual(sorted(winners), [1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
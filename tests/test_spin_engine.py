@@ -0,0 +1,27 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import spin_engine
+from entry_table import EntryTable
+
+
+class SliceBoundsTest(unittest.TestCase):
+    def test_bounds_span_full_turn(self):
+        entries = [{'label': 'A', 'weight': 1}, {'label': 'B', 'weight': 0}, {'label': 'C', 'weight': 3}]
+        bounds = spin_engine.slice_bounds(entries)
+        self.assertEqual(bounds, [0.0, 90.0, 90.0, 360.0])
+        self.assertEqual(spin_engine.slice_bounds(EntryTable(entries)), bounds)
+        # The zero-weight slice is never hit
+        self.assertEqual(spin_engine.index_at_angle(bounds, 90.0), 2)
+
+    def test_no_positive_weight(self):
+        self.assertEqual(spin_engine.slice_bounds([{'label': 'A', 'weight': 0}]), [0.0, 0.0])
+        self.assertEqual(spin_engine.slice_bounds([]), [0.0])
+        self.assertIsNone(spin_engine.index_at_angle([0.0], 10.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import storage
+
+
+class StorageTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="wheel-test-")
+        self.saved_env = os.environ.get("WHEEL_DATA_DIR")
+        self.saved_backend = storage.BACKEND
+        os.environ["WHEEL_DATA_DIR"] = self.directory
+
+    def tearDown(self):
+        storage.set_backend(self.saved_backend)
+        if self.saved_env is None:
+            del os.environ["WHEEL_DATA_DIR"]
+        else:
+            os.environ["WHEEL_DATA_DIR"] = self.saved_env
+        shutil.rmtree(self.directory)
+
+    def write_json(self, filename, data):
+        path = os.path.join(self.directory, filename)
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        return path
+
+    def test_import_rejects_non_object(self):
+        path = self.write_json("list.json", [{'label': 'A', 'weight': 1}])
+        with self.assertRaises(ValueError):
+            storage.import_config(path)
+
+    def test_import_rejects_invalid_entries(self):
+        path = self.write_json("bad.json", {'name': 'bad', 'entries': [1, 2]})
+        with self.assertRaises(ValueError):
+            storage.import_config(path)
+
+    def test_migrate_json_to_compact(self):
+        storage.set_backend("json")
+        storage.save_config("Legacy", [{'label': 'A', 'weight': 2.0}])
+        storage.set_backend("compact")
+        self.assertEqual(storage.list_configs(), [])
+        self.assertEqual(storage.migrate_json_to_compact(), 1)
+        self.assertEqual(storage.list_configs(), ["Legacy"])
+        self.assertEqual(list(storage.load_config("Legacy")["entries"]), [{'label': 'A', 'weight': 2.0}])
+        self.assertEqual(storage.migrate_json_to_compact(), 0)
+
+    def test_profile_trace_is_not_a_config(self):
+        self.write_json("wheel-profile.trace.json", {"traceEvents": []})
+        storage.set_backend("json")
+        self.assertEqual(storage.list_configs(), [])
+
+
+class AutosaveTest(StorageTest):
+    def autosave_path(self):
+        return storage.get_config_path(storage.AUTOSAVE_NAME)
+
+    def test_partial_snapshot_starts_empty(self):
+        with open(self.autosave_path(), 'w') as f:
+            f.write('{"name": "_autosave", "generation": 3, "entries": [{"label": "A", "we')
+        service = storage.AutosaveService()
+        try:
+            self.assertEqual(len(service.entries), 0)
+        finally:
+            service.close()
+        self.assertTrue(os.path.exists(self.autosave_path() + ".corrupt"))
+        self.assertEqual(len(storage.load_autosave()), 0)
+
+    def append_lines(self, *lines):
+        with open(storage.get_journal_path(), 'a') as f:
+            f.write("".join(lines))
+
+    def labels(self, entries):
+        return [e['label'] for e in entries]
+
+    def test_replays_journal_onto_its_generation(self):
+        storage.save_autosave([{'label': 'A', 'weight': 1}], generation=2)
+        storage.append_autosave_journal([{"op": "add", "i": 1, "e": {'label': 'B', 'weight': 2}},
+                                         {"op": "move", "i": 1, "to": 0},
+                                         {"op": "edit", "i": 1, "e": {'label': 'C', 'weight': 3}}])
+        entries, generation, replayed = storage.load_autosave_state()
+        self.assertEqual((self.labels(entries), generation, replayed), (['B', 'C'], 2, 3))
+
+    def test_ignores_stale_journal_after_compaction(self):
+        # Crash after the new snapshot was written but before its journal
+        storage.save_autosave([{'label': 'A', 'weight': 1}], generation=1)
+        storage.append_autosave_journal([{"op": "add", "i": 1, "e": {'label': 'B', 'weight': 1}}])
+        storage.write_json_atomic(self.autosave_path(), {
+            "name": storage.AUTOSAVE_NAME, "generation": 2,
+            "entries": [{'label': 'A', 'weight': 1}, {'label': 'B', 'weight': 1}]})
+        entries, generation, replayed = storage.load_autosave_state()
+        self.assertEqual((self.labels(entries), generation, replayed), (['A', 'B'], 2, 0))
+
+    def test_survives_torn_final_record(self):
+        storage.save_autosave([], generation=1)
+        storage.append_autosave_journal([{"op": "add", "i": 0, "e": {'label': 'A', 'weight': 1}}])
+        self.append_lines('{"op":"add","i":1,"e":{"label":"B"')
+        entries, generation, replayed = storage.load_autosave_state()
+        self.assertEqual((self.labels(entries), replayed), (['A'], 1))
+
+        # The first write of the next session compacts away the torn tail
+        service = storage.AutosaveService(debounce=60)
+        try:
+            service.add(1, {'label': 'C', 'weight': 1})
+            service.flush()
+        finally:
+            service.close()
+        self.assertEqual(service.compactions, 1)
+        entries, generation, replayed = storage.load_autosave_state()
+        self.assertEqual((self.labels(entries), generation, replayed), (['A', 'C'], 2, 0))
+
+    def test_compacts_past_threshold(self):
+        service = storage.AutosaveService(debounce=60, compact_threshold=3)
+        try:
+            service.reset([{'label': 'A', 'weight': 1}])
+            service.flush() # First write of a session: snapshot
+            for label in "BC":
+                service.add(len(service.entries), {'label': label, 'weight': 1})
+            service.flush() # 2 journal records
+            self.assertEqual((service.compactions, service.journal_ops), (1, 2))
+            self.assertEqual(storage.load_autosave_state()[2], 2)
+            for label in "DE":
+                service.add(len(service.entries), {'label': label, 'weight': 1})
+            service.flush() # 4 > 3: snapshot again
+            self.assertEqual((service.compactions, service.journal_ops), (2, 0))
+        finally:
+            service.close()
+        entries, generation, replayed = storage.load_autosave_state()
+        self.assertEqual((self.labels(entries), generation, replayed), (['A', 'B', 'C', 'D', 'E'], 2, 0))
+
+    def test_close_writes_pending_changes(self):
+        service = storage.AutosaveService(debounce=60)
+        service.add(0, {'label': 'A', 'weight': 1})
+        service.remove(0)
+        service.add(0, {'label': 'B', 'weight': 2})
+        service.close()
+        self.assertEqual(self.labels(storage.load_autosave()), ['B'])
+        self.assertEqual(service.coalesced, 2)
+
+    def test_non_object_snapshot_starts_empty(self):
+        self.write_json("_autosave.json", [1, 2, 3])
+        entries, generation, replayed = storage.load_autosave_state()
+        self.assertEqual((len(entries), generation, replayed), (0, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage_sqlite import SQLiteStore
+
+
+class RenameConfigTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="wheel-test-")
+        self.store = SQLiteStore(os.path.join(self.directory, "wheels.sqlite3"))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory)
+
+    def test_rename_missing_keeps_existing_target(self):
+        self.store.save_config("keep", [{'label': 'A', 'weight': 1.0}])
+        self.store.rename_config("missing", "keep")
+        self.assertEqual(self.store.list_configs(), ["keep"])
+        self.assertEqual(list(self.store.load_config("keep")["entries"]), [{'label': 'A', 'weight': 1.0}])
+
+    def test_rename_overwrites_existing_target(self):
+        self.store.save_config("old", [{'label': 'A', 'weight': 1.0}])
+        self.store.save_config("new", [{'label': 'B', 'weight': 2.0}])
+        self.store.rename_config("old", "new")
+        self.assertEqual(self.store.list_configs(), ["new"])
+        self.assertEqual(self.store.load_config("new")["entries"].label(0), 'A')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+import text_render
+
+
+class LabelCacheTest(unittest.TestCase):
+    def test_evicts_least_recently_used_by_bytes(self):
+        cache = text_render.LabelCache(budget_bytes=3 * 10 * 10 * 4)
+        for key in "abc":
+            cache.put(key, Image.new("RGBA", (10, 10)))
+        cache.get("a")
+        cache.put("d", Image.new("RGBA", (10, 10)))
+        self.assertEqual(list(cache.items), ["c", "a", "d"])
+        self.assertEqual(cache.bytes, 3 * 10 * 10 * 4)
+
+    def test_keeps_one_oversized_item(self):
+        cache = text_render.LabelCache(budget_bytes=100)
+        cache.put("big", Image.new("RGBA", (10, 10)))
+        self.assertIsNotNone(cache.get("big"))
+
+    def test_rotated_label_reuses_unrotated_bitmap(self):
+        text_render.clear_caches()
+        first = text_render.rotated_label("Label", 30.0, 14)
+        second = text_render.rotated_label("Label", 120.0, 14)
+        self.assertEqual(len(text_render.LABELS.items), 1)
+        self.assertEqual(first.mode, "RGBA")
+        self.assertNotEqual(first.size, second.size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import storage
+import wheel_format
+from entry_table import EntryTable
+
+ENTRIES = [{'label': 'Plain', 'weight': 1.0},
+           {'label': 'Hex', 'weight': 2.5, 'color': '#ff0000'},
+           {'label': 'Named', 'weight': 0.5, 'color': 'blue'},
+           {'label': 'Ünïcode', 'weight': 3.0, 'color': 'blue'}]
+
+
+def dumped(entries, compress=True, block_size=wheel_format.BLOCK_SIZE):
+    f = io.BytesIO()
+    wheel_format.dump(f, "Test", entries, compress=compress, block_size=block_size)
+    return f.getvalue()
+
+
+class RoundTripTest(unittest.TestCase):
+    def test_round_trip(self):
+        for compress in (True, False):
+            for entries in (ENTRIES, EntryTable(ENTRIES)):
+                data = wheel_format.load(io.BytesIO(dumped(entries, compress, block_size=3)))
+                self.assertEqual(data["name"], "Test")
+                self.assertEqual(list(data["entries"]), ENTRIES)
+
+    def test_iter_load_and_summarize(self):
+        blob = dumped(ENTRIES, block_size=2)
+        name, entries = wheel_format.iter_load(io.BytesIO(blob))
+        self.assertEqual((name, list(entries)), ("Test", ENTRIES))
+        self.assertEqual(wheel_format.summarize(io.BytesIO(blob)), ("Test", 4, 7.0))
+
+    def test_empty_wheel(self):
+        data = wheel_format.load(io.BytesIO(dumped([])))
+        self.assertEqual(len(data["entries"]), 0)
+
+
+class TruncatedFileTest(unittest.TestCase):
+    def setUp(self):
+        self.entries = [{'label': f"Entry {i}", 'weight': 1.0 + i % 7, 'color': 'blue' if i % 3 else '#00ff00'}
+                        for i in range(10000)]
+        self.blob = dumped(self.entries)
+
+    def test_truncated_gzip_raises_value_error(self):
+        for size in (3, 20, len(self.blob) // 2, len(self.blob) - 16):
+            for read in (wheel_format.load, wheel_format.summarize,
+                         lambda f: list(wheel_format.iter_load(f)[1])):
+                with self.assertRaises(ValueError):
+                    read(io.BytesIO(self.blob[:size]))
+
+    def test_truncated_raw_raises_value_error(self):
+        blob = dumped(self.entries, compress=False)
+        with self.assertRaises(ValueError):
+            wheel_format.load(io.BytesIO(blob[:len(blob) // 2]))
+
+    def test_bad_extra_color_raises_value_error(self):
+        blob = bytearray(dumped([{'label': 'A', 'weight': 1.0, 'color': 'blue'}], compress=False))
+        # Drop the block's extra color list: k = 0 and no strings
+        end = blob.rindex(b"blue")
+        blob[end - 8:end + 4] = bytes(4)
+        for read in (wheel_format.load, lambda f: list(wheel_format.iter_load(f)[1])):
+            with self.assertRaises(ValueError):
+                read(io.BytesIO(bytes(blob)))
+
+    def test_storage_lists_truncated_file(self):
+        directory = tempfile.mkdtemp(prefix="wheel-test-")
+        saved_env, saved_backend = os.environ.get("WHEEL_DATA_DIR"), storage.BACKEND
+        os.environ["WHEEL_DATA_DIR"] = directory
+        try:
+            storage.set_backend("compact")
+            storage.save_config("Big", self.entries)
+            storage.save_config("Small", ENTRIES)
+            path = storage.get_config_path("Big")
+            with open(path, 'r+b') as f:
+                f.truncate(os.path.getsize(path) // 2)
+            self.assertEqual(sorted(storage.list_configs()), ["Big", "Small"])
+            with self.assertRaises(ValueError):
+                storage.load_config("Big")
+        finally:
+            storage.set_backend(saved_backend)
+            if saved_env is None:
+                del os.environ["WHEEL_DATA_DIR"]
+            else:
+                os.environ["WHEEL_DATA_DIR"] = saved_env
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from PIL import Image, ImageDraw, ImageFont
+
+DEFAULT_FACE = "arial.ttf"
+ELLIPSIS = "..."
+ANGLE_BUCKET = 0.5 # Degrees; label angles are rounded to this
+LABEL_CACHE_BYTES = 16 * 1024 * 1024
+
+@lru_cache(maxsize=None)
+def get_font(size, face=DEFAULT_FACE):
+    """
+    Returns a cached font object for (face, size), falling back to PIL's
+    built-in font if the face is not available.
+    """
+    try:
+        return ImageFont.truetype(face, size)
+    except IOError:
+        return ImageFont.load_default()
+
+@lru_cache(maxsize=65536)
+def fit_text(text, max_width, size, face=DEFAULT_FACE):
+    """
+    Returns text, truncated with an ellipsis if needed so it is at most
+    max_width pixels wide. Uses a binary search over the prefix length.
+    """
+    font = get_font(size, face)
+    if font.getlength(text) <= max_width:
+        return text
+
+    # Longest prefix that still fits once the ellipsis is appended
+    lo, hi = 0, len(text) - 1
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if font.getlength(text[:mid] + ELLIPSIS) <= max_width:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo] + ELLIPSIS
+
+def angle_bucket(angle):
+    return (round((angle % 360) / ANGLE_BUCKET) * ANGLE_BUCKET) % 360
+
+class LabelCache:
+    """
+    LRU cache of unrotated label bitmaps, bounded by their total size in
+    bytes rather than by count. Safe to use from the render worker.
+    """
+    def __init__(self, budget_bytes=LABEL_CACHE_BYTES):
+        self.budget_bytes = budget_bytes
+        self.items = OrderedDict() # key -> image
+        self.bytes = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            image = self.items.get(key)
+            if image is not None:
+                self.items.move_to_end(key)
+            return image
+
+    def put(self, key, image):
+        size = image.width * image.height * 4
+        with self.lock:
+            if key in self.items:
+                return
+            self.items[key] = image
+            self.bytes += size
+            while self.bytes > self.budget_bytes and len(self.items) > 1:
+                _, old = self.items.popitem(last=False)
+                self.bytes -= old.width * old.height * 4
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+            self.bytes = 0
+
+LABELS = LabelCache()
+
+def label_bitmap(text, size, face=DEFAULT_FACE, fill="white"):
+    """
+    Returns an unrotated RGBA bitmap of text, cached in LABELS. The
+    returned image is shared and must not be modified.
+    """
+    key = (text, size, face, fill)
+    image = LABELS.get(key)
+    if image is None:
+        font = get_font(size, face)
+        text_w = int(font.getlength(text)) + 20
+        text_h = int(size * 2)
+        image = Image.new("RGBA", (text_w, text_h), (0, 0, 0, 0))
+        ImageDraw.Draw(image).text((text_w / 2, text_h / 2), text, font=font, fill=fill, anchor="mm")
+        LABELS.put(key, image)
+    return image
+
+def rotated_label(text, angle, size, face=DEFAULT_FACE, fill="white"):
+    """
+    Returns an RGBA bitmap of text rotated clockwise by angle degrees.
+    Only the unrotated bitmap is cached: slice angles move with every
+    weight change, so rotated ones would rarely be reused.
+    """
+    # PIL rotate is CCW while wheel angles are CW
+    return label_bitmap(text, size, face, fill).rotate(-angle, expand=True, resample=Image.Resampling.BICUBIC)
+
+def clear_caches():
+    fit_text.cache_clear()
+    LABELS.clear()
@@ -0,0 +1,234 @@
+"""
+Compact on-disk format for wheels.
+
+Layout (all integers little-endian uint32), optionally wrapped in gzip:
+
+    MAGIC
+    name length, name (UTF-8)
+    blocks of up to BLOCK_SIZE entries, each:
+        n (entries in block, never 0)
+        n weights (float64)
+        n color codes (see below)
+        n label byte lengths, then the labels (UTF-8) back to back
+        k extra colors: k byte lengths, then the color strings
+    0 (end marker)
+
+A color code is 0 for no color, COLOR_RGB | 0xRRGGBB for '#rrggbb'
+colors and COLOR_EXTRA | i for anything else, i indexing the block's extra
+colors. Hex colors come back lowercase and weights as floats.
+
+Columns are stored per block so both the writer and the reader stream:
+only one block of entries is ever held in memory.
+"""
+import gzip
+import struct
+import sys
+import zlib
+from array import array
+from entry_table import EntryTable, COLOR_EXTRA, hex_color_code, decode_color
+
+MAGIC = b"WHEEL\x00\x01\n"
+BLOCK_SIZE = 4096
+
+_U32 = struct.Struct("<I")
+_LITTLE = sys.byteorder == "little"
+
+def _pack(typecode, values):
+    arr = array(typecode, values)
+    if not _LITTLE:
+        arr.byteswap()
+    return arr.tobytes()
+
+def _unpack(typecode, data):
+    arr = array(typecode)
+    arr.frombytes(data)
+    if not _LITTLE:
+        arr.byteswap()
+    return arr
+
+def _read(f, size):
+    # A gzip stream cut short raises EOFError or zlib.error, not OSError
+    try:
+        return f.read(size)
+    except (EOFError, zlib.error) as e:
+        raise ValueError("Truncated wheel file") from e
+
+def _read_exact(f, size):
+    data = _read(f, size)
+    if len(data) != size:
+        raise ValueError("Truncated wheel file")
+    return data
+
+def _read_u32(f):
+    return _U32.unpack(_read_exact(f, 4))[0]
+
+def _write_strings(f, strings):
+    encoded = [s.encode("utf-8") for s in strings]
+    f.write(_pack("I", [len(b) for b in encoded]))
+    f.write(b"".join(encoded))
+
+def _read_strings(f, count):
+    lengths = _unpack("I", _read_exact(f, 4 * count))
+    blob = _read_exact(f, sum(lengths))
+    strings = []
+    pos = 0
+    for length in lengths:
+        strings.append(blob[pos:pos + length].decode("utf-8"))
+        pos += length
+    return strings
+
+def encode_color(color, extra):
+    """
+    Returns the color code for color, appending it to extra if it is not
+    a '#rrggbb' string.
+    """
+    if not color:
+        return 0
+    code = hex_color_code(color)
+    if code is not None:
+        return code
+    extra.append(color)
+    return COLOR_EXTRA | (len(extra) - 1)
+
+def _write_columns(f, labels, weights, codes, extra):
+    f.write(_U32.pack(len(labels)))
+    f.write(_pack("d", weights))
+    f.write(_pack("I", codes))
+    _write_strings(f, labels)
+    f.write(_U32.pack(len(extra)))
+    _write_strings(f, extra)
+
+def _write_block(f, block):
+    extra = []
+    codes = [encode_color(e.get('color'), extra) for e in block]
+    _write_columns(f, [e['label'] for e in block], [float(e['weight']) for e in block], codes, extra)
+
+def _write_table_block(f, table, start, stop):
+    # Table codes are already in this format; only extra color indices
+    # need remapping to the block's own list
+    extra = []
+    remap = {}
+    codes = table.colors[start:stop]
+    for i, code in enumerate(codes):
+        if code & COLOR_EXTRA:
+            if code not in remap:
+                extra.append(table.extra_colors[code & 0xFFFFFF])
+                remap[code] = COLOR_EXTRA | (len(extra) - 1)
+            codes[i] = remap[code]
+    _write_columns(f, table.labels[start:stop], table.weights[start:stop], codes, extra)
+
+def _dump(f, name, entries, block_size):
+    encoded = name.encode("utf-8")
+    f.write(MAGIC)
+    f.write(_U32.pack(len(encoded)))
+    f.write(encoded)
+    if isinstance(entries, EntryTable):
+        for start in range(0, len(entries), block_size):
+            _write_table_block(f, entries, start, min(start + block_size, len(entries)))
+        f.write(_U32.pack(0))
+        return
+    block = []
+    for entry in entries:
+        block.append(entry)
+        if len(block) == block_size:
+            _write_block(f, block)
+            block = []
+    if block:
+        _write_block(f, block)
+    f.write(_U32.pack(0))
+
+def dump(f, name, entries, compress=True, block_size=BLOCK_SIZE):
+    """
+    Writes a wheel to the binary file object f. entries may be any
+    iterable of entry dicts, e.g. a generator.
+    """
+    if compress:
+        with gzip.GzipFile(fileobj=f, mode="wb", compresslevel=6, mtime=0) as gz:
+            _dump(gz, name, entries, block_size)
+    else:
+        _dump(f, name, entries, block_size)
+
+def _open_stream(f):
+    # gzip streams start with 1f 8b, raw ones with MAGIC
+    head = f.read(2)
+    f.seek(-len(head), 1)
+    if head == b"\x1f\x8b":
+        f = gzip.GzipFile(fileobj=f, mode="rb")
+    if _read(f, len(MAGIC)) != MAGIC:
+        raise ValueError("Not a wheel file")
+    name = _read_exact(f, _read_u32(f)).decode("utf-8")
+    return f, name
+
+def iter_blocks(f):
+    """
+    Returns (name, blocks) where blocks yields (weights, color_codes,
+    labels, extra_colors) per block without building entry dicts.
+    """
+    f, name = _open_stream(f)
+
+    def blocks():
+        while True:
+            n = _read_u32(f)
+            if n == 0:
+                return
+            weights = _unpack("d", _read_exact(f, 8 * n))
+            colors = _unpack("I", _read_exact(f, 4 * n))
+            labels = _read_strings(f, n)
+            extra = _read_strings(f, _read_u32(f))
+            yield weights, colors, labels, extra
+
+    return name, blocks()
+
+def iter_load(f):
+    """
+    Returns (name, entries) where entries lazily yields entry dicts.
+    """
+    name, blocks = iter_blocks(f)
+
+    def entries():
+        for weights, colors, labels, extra in blocks:
+            for weight, code, label in zip(weights, colors, labels):
+                entry = {'label': label, 'weight': weight}
+                try:
+                    color = decode_color(code, extra)
+                except IndexError as e: # Extra color index past the block's list
+                    raise ValueError("Truncated wheel file") from e
+                if color is not None:
+                    entry['color'] = color
+                yield entry
+
+    return name, entries()
+
+def load(f):
+    """
+    Reads a whole wheel into the same dict shape as a JSON config, with the
+    entries as an EntryTable built straight from the columns.
+    """
+    name, blocks = iter_blocks(f)
+    table = EntryTable()
+    for weights, colors, labels, extra in blocks:
+        if extra or max(colors, default=0) >= COLOR_EXTRA:
+            try:
+                colors = array('I', (table.encode_color(extra[c & 0xFFFFFF]) if c & COLOR_EXTRA else c
+                                     for c in colors))
+            except IndexError as e:
+                raise ValueError("Truncated wheel file") from e
+        table.extend_columns(labels, weights, colors)
+    return {"name": name, "entries": table}
+
+def summarize(f):
+    """
+    Returns (name, entry_count, total_weight) while streaming over the file.
+    """
+    name, blocks = iter_blocks(f)
+    count = 0
+    total = 0.0
+    for weights, colors, labels, extra in blocks:
+        count += len(weights)
+        total += sum(weights)
+    return name, count, total
+
+def is_wheel_file(f):
+    head = f.read(len(MAGIC))
+    f.seek(-len(head), 1)
+    return head[:2] == b"\x1f\x8b" or head == MAGIC
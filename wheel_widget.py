@@ -1,8 +1,712 @@
 import tkinter as tk
 import math
-import random
 import time
-from PIL import Image, ImageDraw, ImageTk, ImageFont
+import threading
+import queue
+import traceback
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageColor, ImageDraw, ImageTk
+import text_render
+import spin_engine
+import instrument
+from entry_table import EntryTable, COLOR_RGB
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class RotationFrameCache:
+    """
+    LRU cache of pre-rotated copies of the low-res wheel image, quantized to
+    a fixed number of angle steps. Frames are rendered lazily on first use
+    and can be prefilled on a background thread. The cache holds at most
+    budget_bytes worth of frames.
+    """
+    def __init__(self, steps=360, budget_bytes=128 * 1024 * 1024):
+        self.steps = steps
+        self.budget_bytes = budget_bytes
+        self.frames = OrderedDict()
+        self.source = None
+        self.capacity = 0
+        self.generation = 0 # Bumped on reset so stale prefill work is dropped
+        self.prefilled = None # Generation prefill last ran for
+        self.lock = threading.Lock()
+
+    def reset(self, source):
+        """
+        Drops all cached frames and starts caching rotations of source.
+        """
+        with self.lock:
+            self.generation += 1
+            self.frames.clear()
+            self.source = source
+            if source is None:
+                self.capacity = 0
+            else:
+                frame_bytes = source.width * source.height * len(source.getbands())
+                self.capacity = min(self.steps, self.budget_bytes // max(frame_bytes, 1))
+
+    def step_for(self, angle):
+        return int(round((angle % 360) * self.steps / 360)) % self.steps
+
+    def get(self, angle):
+        """
+        Returns the cached frame nearest to angle, rendering it if needed.
+        """
+        step = self.step_for(angle)
+        with self.lock:
+            frame = self.frames.get(step)
+            if frame is not None:
+                self.frames.move_to_end(step)
+                return frame
+            source = self.source
+            generation = self.generation
+        if source is None:
+            return None
+        frame = self._render(source, step)
+        self._store(step, frame, generation)
+        return frame
+
+    def peek(self, angle):
+        """
+        Returns the cached frame nearest to angle, or None without rendering.
+        """
+        step = self.step_for(angle)
+        with self.lock:
+            frame = self.frames.get(step)
+            if frame is not None:
+                self.frames.move_to_end(step)
+            return frame
+
+    def prefill(self):
+        """
+        Renders up to capacity frames on a daemon thread, once per source.
+        When not every step fits, the prefilled steps are spread evenly
+        over the circle so none of them evicts another.
+        """
+        with self.lock:
+            source = self.source
+            generation = self.generation
+            count = min(self.capacity, self.steps)
+            if source is None or count == 0 or self.prefilled == generation:
+                return
+            self.prefilled = generation
+        steps = sorted({step * self.steps // count for step in range(count)})
+
+        def work():
+            for step in steps:
+                with self.lock:
+                    if self.generation != generation:
+                        return
+                    if step in self.frames:
+                        continue
+                self._store(step, self._render(source, step), generation)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def _render(self, source, step):
+        angle = step * 360 / self.steps
+        return source.rotate(angle, resample=Image.Resampling.BILINEAR, expand=False)
+
+    def _store(self, step, frame, generation):
+        with self.lock:
+            if generation != self.generation or self.capacity == 0:
+                return
+            self.frames[step] = frame
+            self.frames.move_to_end(step)
+            while len(self.frames) > self.capacity:
+                self.frames.popitem(last=False)
+
+class PolarFrameMap:
+    """
+    Produces rotated animation frames without rotating images. Needs NumPy.
+
+    Rotating a wheel only offsets its angles, so the wheel image is
+    resampled once into a polar texture (one row per pixel of radius, one
+    column per angle step, with the columns repeated once so no wrap-around
+    is needed). Every output pixel gets a precomputed index into it. A frame
+    is then a single gather at an angle offset into a reused buffer: labels,
+    outlines and anti-aliasing come along from the texture.
+
+    A map is built for one source image with for_source, which is meant to
+    run off the Tk thread and reuses the previous map's index maps when the
+    size did not change. frame() can gather at a reduced scale for the
+    reduced quality levels of FrameScheduler.
+    """
+    def __init__(self, oversample=1):
+        self.oversample = oversample # Angle steps per pixel at the rim
+        self.size = None
+        self.steps = 0
+        self.rows = 0
+        self.index = None # (height, width) texture index per output pixel
+        self.mesh = []
+        self.layouts = {} # scale -> (flat index, buffer, size)
+        self.texture = None
+
+    def for_source(self, image, scales=(1.0,)):
+        """
+        Returns a new map holding the polar texture of image (RGBA), with
+        index maps ready for the given frame scales. Never changes this map,
+        so it is safe to call on a worker thread while this map is in use.
+        """
+        polar = PolarFrameMap(self.oversample)
+        if self.size == image.size:
+            polar.size, polar.steps, polar.rows = self.size, self.steps, self.rows
+            polar.index, polar.mesh = self.index, self.mesh
+            polar.layouts = dict(self.layouts)
+        else:
+            polar.set_size(image.width, image.height)
+        for scale in scales:
+            polar.layout(scale)
+        polar.set_source(image)
+        return polar
+
+    def set_size(self, width, height):
+        self.size = (width, height)
+        cx, cy = width / 2, height / 2
+        self.rows = int(math.ceil(min(cx, cy))) + 1
+        self.steps = max(360, int(math.ceil(2 * math.pi * min(cx, cy) * self.oversample)))
+
+        ys, xs = np.mgrid[0:height, 0:width]
+        dx = xs + (0.5 - cx)
+        dy = ys + (0.5 - cy)
+        rho = np.hypot(dx, dy)
+        # Angles clockwise from 3 o'clock, as in PIL's pieslice
+        theta = np.degrees(np.arctan2(dy, dx)) % 360.0
+        # Pixels beyond the last row read the transparent row at the end
+        row = np.minimum(rho.astype(np.intp), self.rows)
+        column = (theta * (self.steps / 360.0)).astype(np.intp) % self.steps
+        self.index = row * (2 * self.steps) + column
+        self.layouts = {}
+
+        # set_source unrolls the image with one mesh quad per angle step,
+        # from the center out to the last row
+        reach = self.rows
+        step = 2 * math.pi / self.steps
+        self.mesh = []
+        for i in range(self.steps):
+            a0, a1 = i * step, (i + 1) * step
+            self.mesh.append(((i, 0, i + 1, self.rows),
+                              (cx, cy,
+                               cx + reach * math.cos(a0), cy + reach * math.sin(a0),
+                               cx + reach * math.cos(a1), cy + reach * math.sin(a1),
+                               cx, cy)))
+
+    def layout(self, scale):
+        """
+        Returns (flat index, buffer, size) for frames at scale, sampling
+        every 1/scale-th pixel of the full index map.
+        """
+        layout = self.layouts.get(scale)
+        if layout is None:
+            step = max(1, int(round(1 / scale)))
+            index = self.index[step // 2::step, step // 2::step]
+            height, width = index.shape
+            layout = (np.ascontiguousarray(index).ravel(),
+                      np.empty((height * width, 4), dtype=np.uint8), (width, height))
+            self.layouts[scale] = layout
+        return layout
+
+    def set_source(self, image):
+        """
+        Samples image (RGBA) into the polar texture.
+        """
+        polar = image.convert("RGBA").transform((self.steps, self.rows), Image.Transform.MESH,
+                                                self.mesh, resample=Image.Resampling.BILINEAR)
+        samples = np.asarray(polar)
+
+        texture = np.zeros((self.rows + 1, 2 * self.steps, 4), dtype=np.uint8)
+        texture[:self.rows, :self.steps] = samples
+        texture[:self.rows, self.steps:] = samples
+        self.texture = texture.reshape(-1, 4)
+
+    def frame(self, angle, scale=1.0):
+        """
+        Returns the source rotated counter-clockwise by angle degrees, like
+        Image.rotate, at scale times its size. The image shares a reused
+        buffer, so it is only valid until the next call at that scale.
+        """
+        index, buffer, size = self.layout(scale)
+        # A pixel at angle a shows the source at a + angle
+        offset = int(round((angle % 360) * self.steps / 360.0)) % self.steps
+        np.take(self.texture, index + offset, axis=0, out=buffer)
+        return Image.frombuffer("RGBA", size, buffer, "raw", "RGBA", 0, 1)
+
+class FrameScheduler:
+    """
+    Paces an animation to target_fps. Each frame reports its render cost;
+    the scheduler returns the delay until the next frame deadline and moves
+    a quality level between 0 (best) and max_level: down after
+    downgrade_after frames in a row over budget, up again after
+    upgrade_after frames in a row under headroom * budget.
+
+    Frames that start more than half a frame late count as dropped.
+    """
+    def __init__(self, target_fps=60, max_level=2, downgrade_after=3, upgrade_after=30, headroom=0.6):
+        self.target_fps = target_fps
+        self.budget = 1.0 / target_fps
+        self.max_level = max_level
+        self.downgrade_after = downgrade_after
+        self.upgrade_after = upgrade_after
+        self.headroom = headroom
+        self.level = 0 # Kept across spins so the next one starts at a level that worked
+        self.start(time.perf_counter())
+
+    def start(self, now):
+        self.started = now
+        self.deadline = now
+        self.frames = 0
+        self.dropped = 0
+        self.total_cost = 0.0
+        self.max_cost = 0.0
+        self.over = 0
+        self.under = 0
+        self.level_changes = 0
+
+    def frame_started(self, now):
+        """
+        Call when a frame starts. Counts the frames missed since the last deadline.
+        """
+        late = now - self.deadline
+        if late > self.budget / 2:
+            self.dropped += int(late / self.budget + 0.5)
+            self.deadline = now # Resync instead of trying to catch up
+
+    def frame_done(self, cost, now):
+        """
+        Records a frame that took cost seconds and returns the delay in ms
+        before the next one.
+        """
+        self.frames += 1
+        self.total_cost += cost
+        self.max_cost = max(self.max_cost, cost)
+
+        if cost > self.budget:
+            self.over += 1
+            self.under = 0
+            if self.over >= self.downgrade_after and self.level < self.max_level:
+                self.level += 1
+                self.level_changes += 1
+                self.over = 0
+        elif cost < self.budget * self.headroom:
+            self.under += 1
+            self.over = 0
+            if self.under >= self.upgrade_after and self.level > 0:
+                self.level -= 1
+                self.level_changes += 1
+                self.under = 0
+        else:
+            self.over = self.under = 0
+
+        self.deadline += self.budget
+        return max(1, int(round((self.deadline - now) * 1000)))
+
+    def stats(self, now):
+        """
+        Returns a summary of the frames since start().
+        """
+        duration = now - self.started
+        return {
+            "frames": self.frames,
+            "duration": duration,
+            "fps": self.frames / duration if duration > 0 else 0.0,
+            "target_fps": self.target_fps,
+            "dropped": self.dropped,
+            "mean_frame_ms": 1000 * self.total_cost / self.frames if self.frames else 0.0,
+            "max_frame_ms": 1000 * self.max_cost,
+            "level": self.level,
+            "level_changes": self.level_changes,
+        }
+
+def static_frame(image, angle, size):
+    """
+    Rotates the supersampled wheel image by angle at high quality and
+    scales it down to size for display.
+    """
+    rotated = image.rotate(angle, resample=Image.Resampling.BICUBIC, expand=False)
+    return rotated.resize(size, resample=Image.Resampling.LANCZOS)
+
+def merge_intervals(intervals):
+    """
+    Merges overlapping (start, end) intervals.
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [tuple(m) for m in merged]
+
+def supersample_cap(width, height, entry_count, budget_bytes, full_entries):
+    """
+    Returns the largest integer supersampling factor whose RGBA image fits
+    in budget_bytes, or 1 for wheels with more than full_entries slices,
+    whose edges are mostly merged bands anyway.
+    """
+    if entry_count > full_entries:
+        return 1
+    pixels = max(width * height, 1)
+    return max(1, int(math.sqrt(budget_bytes / (4 * pixels))))
+
+# Peak bytes of fill_numpy temporaries per pixel of a band (float64 arrays)
+NUMPY_BYTES_PER_PIXEL = 256
+
+class WheelRenderer:
+    """
+    Rasterizes a wheel with PIL only, from a snapshot of the widget state,
+    so it can run off the Tk thread.
+
+    With lod set, detail that would not be visible is skipped: runs of
+    slices narrower than min_slice_px (output pixels at the rim) are drawn
+    as one band per band_px of rim in their average color, outlines are
+    dropped on slices narrower than outline_min_px, and labels on slices
+    whose width at the label is below label_min_ratio of the font size.
+    Only pixels change; slice_bounds and so winner lookups stay exact.
+
+    rasterizer "numpy" (when NumPy is installed) fills slices with
+    fill_numpy instead of one ImageDraw.pieslice per slice. It anti-aliases
+    analytically, so it is meant to run at scale 1.
+    """
+    min_slice_px = 1.0
+    band_px = 1.0
+    outline_min_px = 6.0
+    label_min_ratio = 0.75
+    numpy_budget_bytes = 32 * 1024 * 1024 # Temporaries of one fill_numpy band
+
+    def __init__(self, entries, slice_bounds, colors, width, height, scale, lod=False, rasterizer="pil"):
+        self.entries = EntryTable(entries)
+        self.slice_bounds = slice_bounds
+        self.colors = colors
+        self.width = width
+        self.height = height
+        self.scale = scale
+        self.lod = lod
+        self.rasterizer = rasterizer
+        self.rgb_cache = {}
+
+    def slice_span(self, index):
+        return self.slice_bounds[index], self.slice_bounds[index + 1]
+
+    def render(self):
+        """
+        Returns (image, image_low, signatures) for the whole wheel.
+        """
+        w, h, cx, cy, r = self.render_geometry()
+        img = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+        self.render_slices(img, range(len(self.entries)))
+        return img, self.downscale(img), self.slice_signatures()
+
+    def downscale(self, img):
+        """
+        Returns the supersampled image img scaled down to the output size.
+        """
+        if img.size == (self.width, self.height):
+            return img
+        return img.resize((self.width, self.height), resample=Image.Resampling.LANCZOS)
+
+    def render_geometry(self):
+        """
+        Returns (w, h, cx, cy, r) of the supersampled wheel image.
+        """
+        w = int(self.width * self.scale)
+        h = int(self.height * self.scale)
+        r = min(w, h) / 2 - (20 * self.scale)
+        return w, h, w / 2, h / 2, r
+
+    def slice_color(self, index):
+        # Use entry color if specified, otherwise use default palette
+        return self.entries.color(index) or self.colors[index % len(self.colors)]
+
+    def slice_rgb(self, index):
+        color = self.slice_color(index)
+        rgb = self.rgb_cache.get(color)
+        if rgb is None:
+            rgb = self.rgb_cache[color] = ImageColor.getrgb(color)[:3]
+        return rgb
+
+    def slice_signatures(self):
+        """
+        Returns one tuple per slice holding everything that affects its pixels.
+        """
+        return [(label, self.slice_color(i)) + self.slice_span(i) for i, label in enumerate(self.entries.labels)]
+
+    def rerender_sector(self, image, image_low, start, end, margin):
+        """
+        Redraws the sector between start and end (degrees) of image and its
+        downscaled copy image_low in place. Every slice within margin of the
+        sector is redrawn so overlapping labels and outlines come out exactly
+        as in a full render.
+        """
+        w, h, cx, cy, r = self.render_geometry()
+        scale = int(self.scale)
+        
+        # Bounding box of the sector, aligned to the downscale factor
+        pad = 8 * scale
+        xs = [cx]
+        ys = [cy]
+        steps = max(2, int((end - start) / 5) + 1)
+        for k in range(steps + 1):
+            rad = math.radians(start + (end - start) * k / steps)
+            xs.append(cx + (r + pad) * math.cos(rad))
+            ys.append(cy + (r + pad) * math.sin(rad))
+        x0 = max(0, int(min(xs)) - pad) // scale * scale
+        y0 = max(0, int(min(ys)) - pad) // scale * scale
+        x1 = min(w, -(-(int(max(xs)) + pad) // scale) * scale)
+        y1 = min(h, -(-(int(max(ys)) + pad) // scale) * scale)
+        if x1 <= x0 or y1 <= y0:
+            return
+
+        indices = self.indices_in_range(start - margin, end + margin)
+        patch = Image.new("RGBA", (x1 - x0, y1 - y0), (0, 0, 0, 0))
+        self.render_slices(patch, indices, origin=(x0, y0))
+        
+        mask = Image.new("L", patch.size, 0)
+        mr = r + pad
+        ImageDraw.Draw(mask).pieslice([cx - mr - x0, cy - mr - y0, cx + mr - x0, cy + mr - y0],
+                                      start=start, end=end, fill=255)
+        image.paste(patch, (x0, y0), mask)
+
+        # Downscale just the touched region, with enough context for LANCZOS
+        sx0 = max(0, x0 - pad)
+        sy0 = max(0, y0 - pad)
+        sx1 = min(w, x1 + pad)
+        sy1 = min(h, y1 + pad)
+        region = image.crop((sx0, sy0, sx1, sy1))
+        region = region.resize(((sx1 - sx0) // scale, (sy1 - sy0) // scale), resample=Image.Resampling.LANCZOS)
+        inner = region.crop(((x0 - sx0) // scale, (y0 - sy0) // scale,
+                             (x1 - sx0) // scale, (y1 - sy0) // scale))
+        image_low.paste(inner, (x0 // scale, y0 // scale))
+
+    def indices_in_range(self, start, end):
+        """
+        Returns sorted indices of slices overlapping [start, end] degrees,
+        which may extend past 0 or 360.
+        """
+        if end - start >= 360:
+            return list(range(len(self.entries)))
+        bounds = self.slice_bounds
+        last = len(self.entries) - 1
+        found = set()
+        for lo, hi in ((start, end), (start + 360, end + 360), (start - 360, end - 360)):
+            lo = max(lo, 0.0)
+            hi = min(hi, 360.0)
+            if lo > hi:
+                continue
+            first = min(max(bisect_right(bounds, lo) - 1, 0), last)
+            stop = min(bisect_right(bounds, hi), last + 1)
+            found.update(range(first, stop))
+        return sorted(found)
+
+    def render_slices(self, img, indices, origin=(0, 0)):
+        """
+        Draws the given slices and their labels onto img, which covers the
+        supersampled wheel starting at origin.
+        """
+        w, h, cx, cy, r = self.render_geometry()
+        ox, oy = origin
+        thin_angle, band_angle, outline_angle, label_angle = self.lod_angles()
+        
+        if self.rasterizer == "numpy" and np is not None:
+            self.fill_numpy(img, origin)
+            for i in indices:
+                start, end = self.slice_span(i)
+                if end - start >= label_angle:
+                    self.draw_label(img, i, origin)
+            return
+        
+        draw = ImageDraw.Draw(img)
+        bbox = [cx - r - ox, cy - r - oy, cx + r - ox, cy + r - oy]
+        
+        band = None # [bin, start, end, weighted r, g, b sums, weight, first rgb]
+
+        def flush_band():
+            _, start, end, red, green, blue, weight, first = band
+            if end <= start:
+                return
+            if weight > 0:
+                fill = (int(red / weight), int(green / weight), int(blue / weight))
+            else:
+                fill = first
+            draw.pieslice(bbox, start=start, end=end, fill=fill)
+
+        for i in indices:
+            current_angle, end_angle = self.slice_span(i)
+            slice_angle = end_angle - current_angle
+            
+            if slice_angle < thin_angle:
+                # Bins come from the angle alone so sector re-renders merge
+                # exactly like full renders
+                bin_index = int(current_angle / band_angle)
+                rgb = self.slice_rgb(i)
+                if band is None or band[0] != bin_index:
+                    if band is not None:
+                        flush_band()
+                    band = [bin_index, current_angle, end_angle, 0.0, 0.0, 0.0, 0.0, rgb]
+                band[2] = max(band[2], end_angle)
+                band[3] += rgb[0] * slice_angle
+                band[4] += rgb[1] * slice_angle
+                band[5] += rgb[2] * slice_angle
+                band[6] += slice_angle
+                continue
+            if band is not None:
+                flush_band()
+                band = None
+            
+            color = self.slice_color(i)
+            
+            # Draw slice (PIL angles are clockwise from 3 o'clock)
+            if slice_angle >= outline_angle:
+                draw.pieslice(bbox, start=current_angle, end=end_angle, 
+                              fill=color, outline="white", width=int(2*self.scale))
+            else:
+                draw.pieslice(bbox, start=current_angle, end=end_angle, fill=color)
+            
+            if slice_angle >= label_angle:
+                self.draw_label(img, i, origin)
+        
+        if band is not None:
+            flush_band()
+
+    def lod_angles(self):
+        """
+        Returns (thin_angle, band_angle, outline_angle, label_angle): the
+        LOD thresholds in degrees, all 0 except band_angle when lod is off.
+        """
+        w, h, cx, cy, r = self.render_geometry()
+        font_size = int(14 * self.scale)
+        # Pixel sizes are in output pixels
+        px_per_degree = max(math.radians(1) * r / self.scale, 1e-9)
+        band_angle = self.band_px / px_per_degree
+        if not self.lod:
+            return 0.0, band_angle, 0.0, 0.0
+        return (self.min_slice_px / px_per_degree, band_angle, self.outline_min_px / px_per_degree,
+                math.degrees(self.label_min_ratio * font_size / max(r * 0.65, 1e-9)))
+
+    def draw_label(self, img, index, origin=(0, 0)):
+        w, h, cx, cy, r = self.render_geometry()
+        ox, oy = origin
+        font_size = int(14 * self.scale)
+        current_angle, end_angle = self.slice_span(index)
+        
+        # Text handling
+        label = self.entries.label(index)
+        mid_angle = current_angle + (end_angle - current_angle) / 2
+        
+        # Truncate text to approx 70% of radius
+        text = text_render.fit_text(label, int(r * 0.7), font_size)
+        
+        # Unrotated label bitmaps are shared across regenerations
+        rotated_txt = text_render.rotated_label(text, text_render.angle_bucket(mid_angle), font_size)
+        
+        # Calculate position
+        text_radius = r * 0.65
+        rad = math.radians(mid_angle)
+        tx = cx + text_radius * math.cos(rad)
+        ty = cy + text_radius * math.sin(rad)
+        
+        # Paste centered
+        paste_x = int(tx - rotated_txt.width / 2) - ox
+        paste_y = int(ty - rotated_txt.height / 2) - oy
+        
+        img.paste(rotated_txt, (paste_x, paste_y), rotated_txt)
+
+    def palette_array(self):
+        """
+        Returns the slice colors as an (n, 3) float array.
+        """
+        entries = self.entries
+        n = len(entries)
+        codes = np.frombuffer(entries.colors, dtype=np.uint32) if n else np.zeros(0, dtype=np.uint32)
+        defaults = np.array([ImageColor.getrgb(c)[:3] for c in self.colors], dtype=np.float64)
+        rgb = defaults[np.arange(n) % len(self.colors)]
+        hex_rows = (codes & COLOR_RGB) != 0
+        packed = codes[hex_rows] & 0xFFFFFF
+        rgb[hex_rows] = np.stack([(packed >> 16) & 0xFF, (packed >> 8) & 0xFF, packed & 0xFF], axis=1)
+        # Named colors are rare; resolve them one by one
+        for i in np.nonzero((codes != 0) & ~hex_rows)[0]:
+            rgb[i] = self.slice_rgb(int(i))
+        return rgb
+
+    def fill_numpy(self, img, origin=(0, 0)):
+        """
+        Rasterizes the slice fills and outlines of img with NumPy,
+        anti-aliased analytically instead of by supersampling: each pixel
+        gets the average color over its angular footprint (a box filter over
+        the cumulative color integral, so sub-pixel slices blend exactly),
+        outline and rim coverage from its distance to them.
+        Slice geometry (slice_bounds, center, radius) matches render_slices.
+
+        Only the wheel's bounding square is touched (img is expected to be
+        transparent elsewhere), in bands of rows whose temporaries fit in
+        numpy_budget_bytes.
+        """
+        w, h, cx, cy, r = self.render_geometry()
+        ox, oy = origin
+        thin_angle, band_angle, outline_angle, label_angle = self.lod_angles()
+        n = len(self.entries)
+        if n == 0:
+            return
+        x0 = max(0, math.floor(cx - r - ox))
+        x1 = min(img.width, math.ceil(cx + r - ox))
+        y0 = max(0, math.floor(cy - r - oy))
+        y1 = min(img.height, math.ceil(cy + r - oy))
+        if x1 <= x0 or y1 <= y0:
+            return
+        bounds = np.asarray(self.slice_bounds, dtype=np.float64)
+        spans = np.diff(bounds)
+        rgb = self.palette_array()
+        
+        # Color integral over angle: F(a) = cum[i] + rgb[i] * (a - bounds[i])
+        cum = np.zeros((n + 1, 3))
+        np.cumsum(rgb * spans[:, None], axis=0, out=cum[1:])
+        full_turn = cum[-1]
+        
+        def integral(a):
+            turns = np.floor(a / 360.0)
+            a = a - turns * 360.0
+            i = np.clip(np.searchsorted(bounds, a, side='right') - 1, 0, n - 1)
+            return turns[..., None] * full_turn + cum[i] + rgb[i] * (a - bounds[i])[..., None]
+        
+        # Outlines: white along outlined slice edges and the rim of outlined slices
+        outlined = spans >= outline_angle
+        edge = np.zeros(n + 1, dtype=bool)
+        edge[:-1] |= outlined
+        edge[1:] |= outlined
+        edge[0] = edge[-1] = edge[0] | edge[-1] # 0 and 360 are the same edge
+        line = int(2 * self.scale)
+        
+        xs = np.arange(x0, x1) + (ox + 0.5 - cx)
+        rows = max(1, self.numpy_budget_bytes // (NUMPY_BYTES_PER_PIXEL * (x1 - x0)))
+        for top in range(y0, y1, rows):
+            bottom = min(top + rows, y1)
+            # Pixel centers relative to the wheel center
+            dy, dx = np.meshgrid(np.arange(top, bottom) + (oy + 0.5 - cy), xs, indexing='ij')
+            rho = np.hypot(dx, dy)
+            angle = np.degrees(np.arctan2(dy, dx)) % 360.0
+            del dx, dy
+            
+            # Angular footprint of one pixel, capped at a full turn near the center
+            half = np.minimum(np.degrees(0.5 / np.maximum(rho, 1e-9)), 180.0)
+            color = (integral(angle + half) - integral(angle - half)) / (2 * half)[..., None]
+            del half
+            
+            index = np.clip(np.searchsorted(bounds, angle, side='right') - 1, 0, n - 1)
+            dist = np.where(edge[index], np.radians(angle - bounds[index]) * rho, np.inf)
+            np.minimum(dist, np.where(edge[index + 1], np.radians(bounds[index + 1] - angle) * rho, np.inf), out=dist)
+            coverage = np.clip(line / 2 + 0.5 - dist, 0.0, 1.0)
+            rim = np.where(outlined[index], np.clip(rho - (r - line) + 0.5, 0.0, 1.0), 0.0)
+            np.maximum(coverage, rim, out=coverage)
+            del dist, rim, index, angle
+            color += (255.0 - color) * coverage[..., None]
+            
+            alpha = np.clip(r - rho + 0.5, 0.0, 1.0) * 255.0
+            pixels = np.dstack([color, alpha]).round().astype(np.uint8)
+            pixels[alpha == 0] = 0 # Same fully transparent black as render_slices
+            img.paste(Image.fromarray(pixels, "RGBA"), (x0, top))
 
 class WheelWidget(tk.Canvas):
     def __init__(self, master, width=400, height=400, **kwargs):
@@ -17,7 +721,10 @@ class WheelWidget(tk.Canvas):
         if 'highlightthickness' not in kwargs:
             kwargs['highlightthickness'] = 0
         super().__init__(master, width=width, height=height, **kwargs)
-        self.entries = []
+        self.entries = EntryTable()
+        self.loading = False # Set while the owner is still loading entries; cleared by set_entries
+        self.total_weight = 0
+        self.slice_bounds = [0.0] # Cumulative slice angles, len(entries) + 1
         self.angle = 0
         self.is_spinning = False
         self.width = width
@@ -27,12 +734,92 @@ class WheelWidget(tk.Canvas):
         self.radius = min(width, height) / 2 - 20
         
         self.render_scale = 2 # Supersampling for anti-aliasing
+        self.image_scale = self.render_scale # Scale wheel_image was actually rendered at
+        
+        # Level of detail: merge sub-pixel slices, drop outlines and labels
+        # that would not be visible, and cap supersampling so the
+        # supersampled image stays within render_budget_bytes (no
+        # supersampling at all above lod_supersample_entries slices).
+        self.lod = True
+        self.render_budget_bytes = 32 * 1024 * 1024
+        self.lod_supersample_entries = 5000
+        
+        # "pil" draws one pieslice per slice on a supersampled image, "numpy"
+        # rasterizes all slices at once with analytic anti-aliasing at 1x.
+        # "auto" uses numpy (when installed) from numpy_min_entries slices,
+        # below which the per-slice path is cheaper. The numpy cost grows
+        # with the wheel's area only, the per-slice one with the entries and
+        # the square of the supersampling, so when the render budget keeps
+        # the latter at 1x anyway (large canvases) numpy only pays off from
+        # numpy_min_entries_1x.
+        self.rasterizer = "auto"
+        self.numpy_min_entries = 200
+        self.numpy_min_entries_1x = 1500
+        
+        # Resize handling: show a cheap scaled preview right away, then after
+        # the size has settled for resize_settle_ms render each scale in
+        # resize_tiers in turn (the last one should be render_scale).
+        self.resize_settle_ms = 150
+        self.resize_tiers = [1, self.render_scale]
+        self.resize_preview_resample = Image.Resampling.BILINEAR
+        self.resize_job = None
+        self.resize_tier = 0
+        self.resize_token = 0 # Bumped per resize so older tier chains stop
         
         self.colors = ["#FF6B6B", "#4ECDC4", "#45B7D1", "#96CEB4", "#FFEEAD", "#D4A5A5", "#9B59B6", "#3498DB"]
         
         self.wheel_image = None
+        self.wheel_image_low = None
+        self.rendered_signatures = None # Per-slice state behind wheel_image
+        self.rendered_size = None
         self.tk_image = None
+        self.frame_cache = RotationFrameCache()
+        # With NumPy, spin frames come from a polar map instead of rotations.
+        # Maps are built on the render worker by reset_frames;
+        # polar_frames is (frames_generation it was built for, map).
+        self.frames_generation = 0
+        self.polar_frames = (0, None)
+        # Without NumPy, frame_cache is prefilled once the wheel has been
+        # idle for prefill_idle_ms after a change
+        self.prefill_idle_ms = 500
+        self.prefill_job = None
+        
+        # Background rendering: jobs carry a generation number and only the
+        # result for the latest generation is swapped in.
+        self.render_executor = ThreadPoolExecutor(max_workers=1)
+        self.render_results = queue.Queue()
+        self.render_generation = 0
+        self.rendered_generation = 0
+        self.entries_version = 0 # Bumped by set_entries
+        self.rendered_entries_version = 0 # entries_version behind wheel_image
+        self.render_poll_ms = 16
+        self.render_poll_job = None
+        self.requested_render = None # (width, height, scale) of the latest render started
+        # Optional render_cache.RenderCache: full renders at the final scale
+        # are stored there and looked up before rendering
+        self.render_cache = None
+        self.pending_spin = None # spin() arguments of a spin waiting for its image
+        self.last_spin = None # spin_engine.Spin of the current or last spin
+        
+        # Spin animation: frame_scheduler paces frames to its target FPS and
+        # picks a level of spin_quality_levels, (resample, scale) used for
+        # frames missing from frame_cache. Level 0 renders through the cache.
+        # Polar map frames only use the scale.
+        self.spin_quality_levels = [
+            (Image.Resampling.BILINEAR, 1.0),
+            (Image.Resampling.NEAREST, 1.0),
+            (Image.Resampling.NEAREST, 0.5),
+        ]
+        self.frame_scheduler = FrameScheduler(max_level=len(self.spin_quality_levels) - 1)
+        self.spin_stats = None # FrameScheduler.stats() of the last finished spin
+        self.reduced_image = None # (source, scale, image) for reduced quality levels
+        
+        # Instrumentation HUD, only shown while instrument.enabled()
+        self.hud_item = None
+        self.hud_interval = 0.25
+        self.hud_updated = 0.0
         
+        self.create_items()
         self.bind("<Configure>", self.on_resize)
 
     def on_resize(self, event):
@@ -41,165 +828,526 @@ class WheelWidget(tk.Canvas):
         self.center_x = self.width / 2
         self.center_y = self.height / 2
         self.radius = min(self.width, self.height) / 2 - 20
-        self.generate_wheel_image()
-        self.draw_wheel()
+        
+        self.show_resize_preview()
+        
+        # Coalesce bursts of <Configure> events into one regeneration
+        if self.resize_job is not None:
+            self.after_cancel(self.resize_job)
+        self.resize_token += 1
+        self.resize_tier = 0
+        self.resize_job = self.after(self.resize_settle_ms, self.run_resize_tier, self.resize_token)
+
+    def show_resize_preview(self):
+        """
+        Displays the current wheel scaled to the new radius without re-rendering.
+        """
+        if not self.entries or self.wheel_image_low is None:
+            self.draw_wheel()
+            return
+        
+        self.layout_items()
+        self.set_wheel_visible(True)
+        rotated = self.wheel_image_low.rotate(self.angle, resample=self.resize_preview_resample, expand=False)
+        self.show_frame(rotated.resize(self.display_size(), resample=self.resize_preview_resample))
+        self.tag_raise("overlay")
+
+    def display_size(self):
+        """
+        Size to show the wheel image at. A render made for an older canvas
+        size is scaled uniformly so the wheel stays round until it is replaced.
+        """
+        if self.rendered_size is None or self.rendered_size == (self.width, self.height):
+            return self.width, self.height
+        old_w, old_h = self.rendered_size
+        old_radius = min(old_w, old_h) / 2 - 20
+        k = self.radius / old_radius if old_radius > 0 and self.radius > 0 else 1
+        return max(1, round(old_w * k)), max(1, round(old_h * k))
+
+    def run_resize_tier(self, token):
+        if token != self.resize_token:
+            return
+        self.resize_job = None
+        if self.requested_render == (self.width, self.height, self.target_scale()):
+            # The latest render already has this size at full quality, e.g.
+            # the first render at startup; earlier tiers would only replace it
+            return
+        scale = self.resize_tiers[self.resize_tier]
+        self.resize_tier += 1
+        
+        # Start the next tier once this one has been swapped in. A newer
+        # render (another resize or an entry change) makes this one stale,
+        # so its callback never runs.
+        callback = None
+        if self.resize_tier < len(self.resize_tiers):
+            callback = lambda: self.run_resize_tier(token)
+        self.generate_wheel_image(scale=scale, callback=callback)
 
     def set_entries(self, entries):
         """
-        entries: list of dicts {'label': str, 'weight': float}
+        entries: an EntryTable, or a list of dicts {'label': str, 'weight': float}
         """
-        self.entries = entries
-        self.generate_wheel_image()
+        self.entries = EntryTable.coerce(entries)
+        self.loading = False
+        self.entries_version += 1
+        self.rebuild_index()
+        self.update_wheel_image()
         self.draw_wheel()
 
-    def generate_wheel_image(self):
+    def rebuild_index(self):
+        """
+        Rebuilds the cumulative angle table used for angle -> entry lookups.
+        Must be called whenever entries or their weights change.
+        """
+        self.total_weight = self.entries.total_weight()
+        self.slice_bounds = spin_engine.slice_bounds(self.entries)
+
+    def slice_span(self, index):
+        """
+        Returns (start_angle, end_angle) of the slice at index.
+        """
+        return self.slice_bounds[index], self.slice_bounds[index + 1]
+
+    def index_at_angle(self, angle):
+        """
+        Returns the index of the entry whose slice contains angle, or None.
+        """
         if not self.entries:
+            return None
+        return spin_engine.index_at_angle(self.slice_bounds, angle)
+
+    def target_scale(self, scale=None):
+        """
+        Returns the supersampling factor to render at: scale (default
+        render_scale), capped by the LOD limits.
+        """
+        if self.active_rasterizer() == "numpy":
+            return 1
+        return self.pil_scale(scale)
+
+    def pil_scale(self, scale=None):
+        """
+        Returns the supersampling factor the per-slice rasterizer would use.
+        """
+        scale = scale or self.render_scale
+        if not self.lod:
+            return scale
+        return min(scale, supersample_cap(self.width, self.height, len(self.entries),
+                                          self.render_budget_bytes, self.lod_supersample_entries))
+
+    def active_rasterizer(self):
+        if np is None or self.rasterizer == "pil":
+            return "pil"
+        if self.rasterizer == "auto":
+            # Depends on the canvas, not on a resize tier's scale, so every
+            # tier of a resize uses the same rasterizer
+            supersampled = self.pil_scale() > 1
+            if len(self.entries) < (self.numpy_min_entries if supersampled else self.numpy_min_entries_1x):
+                return "pil"
+        return "numpy"
+
+    def make_renderer(self, scale=None):
+        renderer = WheelRenderer(self.entries, self.slice_bounds, self.colors,
+                                 self.width, self.height, self.target_scale(scale),
+                                 lod=self.lod, rasterizer=self.active_rasterizer())
+        renderer.numpy_budget_bytes = self.render_budget_bytes
+        return renderer
+
+    def generate_wheel_image(self, scale=None, callback=None):
+        """
+        Starts a full render on the worker thread. The current wheel stays on
+        screen until the new image is swapped in by poll_render; callback, if
+        given, runs on the Tk thread right after that swap.
+        """
+        self.render_generation += 1
+        if not self.entries:
+            self.image_scale = self.target_scale(scale)
             self.wheel_image = None
+            self.wheel_image_low = None
+            self.rendered_signatures = None
+            self.rendered_generation = self.render_generation
+            self.rendered_entries_version = self.entries_version
+            self.requested_render = None
+            self.reset_frames()
             return
 
-        w = int(self.width * self.render_scale)
-        h = int(self.height * self.render_scale)
-        r = min(w, h) / 2 - (20 * self.render_scale)
-        cx = w / 2
-        cy = h / 2
+        generation = self.render_generation
+        version = self.entries_version
+        renderer = self.make_renderer(scale)
+        self.requested_render = (renderer.width, renderer.height, renderer.scale)
+        cache = self.render_cache
+        final = renderer.scale == self.target_scale()
+
+        def work():
+            # Skip jobs that were superseded while waiting in the queue
+            if generation != self.render_generation:
+                return
+            snapshot = None
+            try:
+                result = None
+                if cache is not None:
+                    with instrument.span("render.cache"):
+                        result = cache.load_render(renderer)
+                if result is None:
+                    with instrument.span("render"):
+                        result = renderer.render()
+                    if cache is not None and final:
+                        # Sector re-renders change the swapped-in image in place
+                        image, low, _ = result
+                        snapshot = image.copy(), None if low is image else low.copy()
+            except Exception:
+                traceback.print_exc()
+                result = None
+            self.render_results.put((generation, version, renderer, result, callback))
+            # Stored after queueing the result so encoding never delays the swap
+            if snapshot is not None:
+                with instrument.span("render.store"):
+                    cache.store_render(renderer, *snapshot)
+
+        self.render_executor.submit(work)
+        if self.render_poll_job is None:
+            self.render_poll_job = self.after(self.render_poll_ms, self.poll_render)
+
+    def poll_render(self):
+        """
+        Swaps finished renders in on the Tk thread, dropping stale ones.
+        """
+        self.render_poll_job = None
+        while True:
+            try:
+                generation, version, renderer, result, callback = self.render_results.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self.render_generation:
+                continue
+            if result is None:
+                # Render failed; keep showing the previous wheel
+                self.rendered_generation = generation
+                continue
+            self.wheel_image, self.wheel_image_low, self.rendered_signatures = result
+            self.image_scale = renderer.scale
+            self.rendered_size = (renderer.width, renderer.height)
+            self.rendered_generation = generation
+            self.rendered_entries_version = version
+            self.reset_frames()
+            if not self.is_spinning:
+                self.draw_wheel()
+            if callback:
+                callback()
+            if self.pending_spin is not None:
+                pending, self.pending_spin = self.pending_spin, None
+                self.spin(*pending)
+
+        if self.render_in_flight():
+            self.render_poll_job = self.after(self.render_poll_ms, self.poll_render)
+
+    def render_in_flight(self):
+        return self.rendered_generation != self.render_generation
+
+    def image_ready(self):
+        """
+        True once wheel_image was rendered from the current entries (possibly
+        at a stale size, which is still fine to spin).
+        """
+        return self.wheel_image is not None and self.rendered_entries_version == self.entries_version
+
+    def update_wheel_image(self):
+        """
+        Re-rasterizes only the angular sectors whose slices changed since the
+        last render and composites them onto the cached wheel image. Falls
+        back to generate_wheel_image when there is no usable previous render
+        or most of the wheel changed.
+        """
+        if (not self.entries or self.wheel_image is None or self.render_in_flight()
+                or not self.rendered_signatures
+                or self.rendered_size != (self.width, self.height)
+                or self.image_scale != self.target_scale()
+                or not float(self.image_scale).is_integer()):
+            self.generate_wheel_image()
+            return
+
+        renderer = self.make_renderer(self.image_scale)
+        old = self.rendered_signatures
+        new = renderer.slice_signatures()
+        dirty = []
+        for i in range(max(len(old), len(new))):
+            before = old[i] if i < len(old) else None
+            after = new[i] if i < len(new) else None
+            if before != after:
+                for sig in (before, after):
+                    if sig is not None:
+                        dirty.append((sig[2], sig[3]))
+        if not dirty:
+            self.rendered_entries_version = self.entries_version
+            return
+
+        intervals = merge_intervals(dirty)
+        if sum(end - start for start, end in intervals) > 180:
+            self.generate_wheel_image()
+            return
+
+        w, h, cx, cy, r = renderer.render_geometry()
+        # Angular reach of a label or outline beyond its own slice
+        margin = math.degrees(math.atan2(14 * self.image_scale, r * 0.3)) + 1
+        with instrument.span("render.sector"):
+            for start, end in intervals:
+                renderer.rerender_sector(self.wheel_image, self.wheel_image_low,
+                                         start - margin, end + margin, margin)
+
+        self.rendered_signatures = new
+        self.rendered_entries_version = self.entries_version
+        self.reset_frames()
+
+    def create_items(self):
+        """
+        Creates the persistent canvas items. draw_wheel only updates them.
+        """
+        self.placeholder_oval = self.create_oval(0, 0, 0, 0, fill="#E0E0E0", outline="#333", tags="placeholder")
+        self.placeholder_text = self.create_text(0, 0, text="Add entries\nto spin!", font=("Arial", 14), justify="center", tags="placeholder")
         
-        img = Image.new("RGBA", (w, h), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        self.image_item = self.create_image(0, 0, tags="wheel")
+        # Pointer (Triangle at 3 o'clock)
+        self.pointer_item = self.create_polygon(0, 0, 0, 0, 0, 0, fill="#333", outline="white", width=2, tags="wheel")
+        # Center hub
+        self.hub_item = self.create_oval(0, 0, 0, 0, fill="white", outline="#333", tags="wheel")
         
-        total_weight = sum(e['weight'] for e in self.entries)
-        current_angle = 0
+        self.layout_key = None
+        self.wheel_visible = None
+
+    def layout_items(self):
+        """
+        Moves the persistent items to match the current size.
+        """
+        key = (self.center_x, self.center_y, self.radius)
+        if key == self.layout_key:
+            return
+        self.layout_key = key
         
-        # Font setup
-        font_size = int(14 * self.render_scale)
-        try:
-            font = ImageFont.truetype("arial.ttf", font_size)
-        except IOError:
-            font = ImageFont.load_default()
+        cx, cy, r = key
+        self.coords(self.placeholder_oval, cx - r, cy - r, cx + r, cy + r)
+        self.coords(self.placeholder_text, cx, cy)
+        self.coords(self.image_item, cx, cy)
+        
+        px = cx + r + 15
+        py = cy
+        self.coords(self.pointer_item, px, py - 10, px, py + 10, px - 25, py)
+        
+        self.coords(self.hub_item, cx - 10, cy - 10, cx + 10, cy + 10)
+        self.coords("overlay", cx, cy)
 
-        for i, entry in enumerate(self.entries):
-            slice_angle = (entry['weight'] / total_weight) * 360
-            end_angle = current_angle + slice_angle
-            
-            # Use entry color if specified, otherwise use default palette
-            color = entry.get('color') or self.colors[i % len(self.colors)]
-            
-            # Draw slice (PIL angles are clockwise from 3 o'clock)
-            draw.pieslice([cx - r, cy - r, cx + r, cy + r], 
-                          start=current_angle, end=end_angle, 
-                          fill=color, outline="white", width=int(2*self.render_scale))
-            
-            # Text handling
-            label = entry['label']
-            mid_angle = current_angle + slice_angle / 2
-            
-            # Max width for text (approx 70% of radius)
-            max_text_width = r * 0.7
-            
-            # Truncate text if too long
-            text = label
-            while font.getlength(text) > max_text_width and len(text) > 0:
-                text = text[:-1]
-            if len(text) < len(label):
-                text = text[:-3] + "..." if len(text) > 3 else "..."
-                # Ensure it fits with ellipsis
-                while font.getlength(text) > max_text_width and len(text) > 3:
-                    text = text[:-4] + "..."
-            
-            # Draw text onto a separate image to rotate it
-            text_w = int(font.getlength(text)) + 20
-            text_h = int(font_size * 2)
-            txt_img = Image.new("RGBA", (text_w, text_h), (0,0,0,0))
-            txt_draw = ImageDraw.Draw(txt_img)
-            txt_draw.text((text_w/2, text_h/2), text, font=font, fill="white", anchor="mm")
-            
-            # Rotate text to match slice
-            # We rotate by -mid_angle because PIL rotate is CCW and our angles are CW
-            rotated_txt = txt_img.rotate(-mid_angle, expand=True, resample=Image.Resampling.BICUBIC)
-            
-            # Calculate position
-            text_radius = r * 0.65
-            rad = math.radians(mid_angle)
-            tx = cx + text_radius * math.cos(rad)
-            ty = cy + text_radius * math.sin(rad)
-            
-            # Paste centered
-            paste_x = int(tx - rotated_txt.width / 2)
-            paste_y = int(ty - rotated_txt.height / 2)
-            
-            img.paste(rotated_txt, (paste_x, paste_y), rotated_txt)
-            
-            current_angle += slice_angle
-            
-        self.wheel_image = img
-        self.wheel_image_low = img.resize((self.width, self.height), resample=Image.Resampling.LANCZOS)
+    def set_wheel_visible(self, visible):
+        if visible == self.wheel_visible:
+            return
+        self.wheel_visible = visible
+        self.itemconfigure("wheel", state="normal" if visible else "hidden")
+        self.itemconfigure("placeholder", state="hidden" if visible else "normal")
+
+    def show_frame(self, frame):
+        """
+        Writes frame into the reused PhotoImage, reallocating only on size change.
+        """
+        with instrument.span("draw.photoimage"):
+            if self.tk_image is not None and (self.tk_image.width(), self.tk_image.height()) == frame.size:
+                self.tk_image.paste(frame)
+            else:
+                self.tk_image = ImageTk.PhotoImage(frame)
+                self.itemconfigure(self.image_item, image=self.tk_image)
 
     def draw_wheel(self, fast=False):
-        self.delete("all")
-        
-        if not self.entries or not self.wheel_image:
-            self.create_oval(self.center_x - self.radius, self.center_y - self.radius,
-                             self.center_x + self.radius, self.center_y + self.radius,
-                             fill="#E0E0E0", outline="#333")
-            self.create_text(self.center_x, self.center_y, text="Add entries\nto spin!", font=("Arial", 14), justify="center")
+        frame = None
+        if self.entries and self.wheel_image:
+            with instrument.span("draw.rotate"):
+                if fast and self.wheel_image_low:
+                    # Fast render for animation
+                    frame = self.spin_frame()
+                else:
+                    # High quality render for static display
+                    frame = static_frame(self.wheel_image, self.angle, self.display_size())
+
+        # One span per frame for all canvas work (draw.photoimage included)
+        with instrument.span("draw.canvas"):
+            self.layout_items()
+            if frame is None:
+                self.set_wheel_visible(False)
+                if self.loading:
+                    text = "Loading..."
+                else:
+                    text = "Rendering..." if self.entries else "Add entries\nto spin!"
+                self.itemconfigure(self.placeholder_text, text=text)
+                return
+
+            self.set_wheel_visible(True)
+            self.show_frame(frame)
+            # Keep the winner overlay and HUD above the wheel
+            self.tag_raise("overlay")
+            self.update_hud()
+
+    def update_hud(self, force=False):
+        """
+        Shows FPS and stage timings in the corner while instrumentation is
+        enabled. Refreshed at most every hud_interval seconds.
+        """
+        if not instrument.enabled():
+            if self.hud_item is not None:
+                self.delete(self.hud_item)
+                self.hud_item = None
+            return
+        now = time.perf_counter()
+        if not force and now - self.hud_updated < self.hud_interval:
             return
+        self.hud_updated = now
 
-        if fast and hasattr(self, 'wheel_image_low') and self.wheel_image_low:
-            # Fast render for animation
-            rotated = self.wheel_image_low.rotate(self.angle, resample=Image.Resampling.BILINEAR, expand=False)
-            self.tk_image = ImageTk.PhotoImage(rotated)
+        stages = instrument.PROFILER.stages
+        def p95(name):
+            return stages[name].summary()["p95_ms"] if name in stages else 0.0
+        def last(name):
+            return stages[name].last() * 1000 if name in stages else 0.0
+        if self.is_spinning:
+            fps = self.frame_scheduler.stats(now)["fps"]
+            dropped = self.frame_scheduler.dropped
+        elif self.spin_stats:
+            fps, dropped = self.spin_stats["fps"], self.spin_stats["dropped"]
         else:
-            # High quality render for static display
-            rotated = self.wheel_image.rotate(self.angle, resample=Image.Resampling.BICUBIC, expand=False)
-            # Resize for display
-            resized = rotated.resize((self.width, self.height), resample=Image.Resampling.LANCZOS)
-            self.tk_image = ImageTk.PhotoImage(resized)
-        
-        self.create_image(self.center_x, self.center_y, image=self.tk_image)
-        
-        # Draw pointer (Triangle at 3 o'clock)
-        px = self.center_x + self.radius + 15
-        py = self.center_y
-        
-        self.create_polygon(px, py - 10,
-                            px, py + 10,
-                            px - 25, py,
-                            fill="#333", outline="white", width=2)
-        
-        # Center hub
-        self.create_oval(self.center_x - 10, self.center_y - 10,
-                         self.center_x + 10, self.center_y + 10,
-                         fill="white", outline="#333")
+            fps, dropped = 0.0, 0
+        text = (f"{fps:5.1f} fps  {dropped} dropped  q{self.frame_scheduler.level}\n"
+                f"frame p95 {p95('spin.frame'):.1f} ms\n"
+                f"rotate {p95('draw.rotate'):.1f}  photo {p95('draw.photoimage'):.1f} ms\n"
+                f"render {last('render'):.0f} ms")
+        if self.hud_item is None:
+            self.hud_item = self.create_text(8, 8, anchor="nw", font=("Courier", 9), fill="#00FF66", tags="hud")
+        self.itemconfigure(self.hud_item, text=text)
+        self.tag_raise(self.hud_item)
+
+    def reset_frames(self):
+        """
+        Drops animation frames of the previous wheel image. With NumPy, a
+        polar map for the new one is built on the render worker; rotated
+        frames are only prefilled without it.
+        """
+        self.frames_generation += 1
+        self.frame_cache.reset(self.wheel_image_low)
+        if self.wheel_image_low is None:
+            return
+        if np is None:
+            # Prefill once edits have paused, or when a spin starts
+            if self.prefill_job is not None:
+                self.after_cancel(self.prefill_job)
+            self.prefill_job = self.after(self.prefill_idle_ms, self.start_prefill)
+            return
+
+        generation = self.frames_generation
+        # Sector re-renders change wheel_image_low in place
+        source = self.wheel_image_low.copy()
+        template = self.polar_frames[1] or PolarFrameMap()
+        scales = sorted({scale for _, scale in self.spin_quality_levels})
+
+        def work():
+            if generation != self.frames_generation:
+                return
+            try:
+                with instrument.span("render.polar"):
+                    polar = template.for_source(source, scales)
+            except Exception:
+                traceback.print_exc()
+                return
+            self.polar_frames = (generation, polar)
+
+        self.render_executor.submit(work)
 
-    def spin(self, callback=None):
+    def start_prefill(self):
+        if self.prefill_job is not None:
+            self.after_cancel(self.prefill_job)
+            self.prefill_job = None
+        self.frame_cache.prefill()
+
+    def spin_frame(self):
+        """
+        Returns the animation frame for the current angle at the quality
+        level chosen by frame_scheduler: from the polar map once it is
+        built, else a rotated frame.
+        """
+        level = self.frame_scheduler.level
+        generation, polar = self.polar_frames
+        if polar is not None and generation == self.frames_generation:
+            # A gather costs the same at any angle, so levels only lower
+            # the resolution it is done at
+            resample, scale = self.spin_quality_levels[level]
+            frame = polar.frame(self.angle, scale)
+            if frame.size != self.wheel_image_low.size:
+                frame = frame.resize(self.wheel_image_low.size, resample=Image.Resampling.NEAREST)
+            return frame
+        if level == 0:
+            return self.frame_cache.get(self.angle)
+        # Cached frames are free at any level
+        frame = self.frame_cache.peek(self.angle)
+        if frame is not None:
+            return frame
+        resample, scale = self.spin_quality_levels[level]
+        frame = self.reduced_source(scale).rotate(self.angle, resample=resample, expand=False)
+        if scale != 1.0:
+            frame = frame.resize(self.wheel_image_low.size, resample=Image.Resampling.NEAREST)
+        return frame
+
+    def reduced_source(self, scale):
+        """
+        Returns wheel_image_low scaled by scale, cached until it changes.
+        """
+        source = self.wheel_image_low
+        if scale == 1.0:
+            return source
+        cached = self.reduced_image
+        if cached is None or cached[0] is not source or cached[1] != scale:
+            size = (max(1, int(source.width * scale)), max(1, int(source.height * scale)))
+            cached = (source, scale, source.resize(size, resample=Image.Resampling.BILINEAR))
+            self.reduced_image = cached
+        return cached[2]
+
+    def spin(self, callback=None, seed=None, plan=None):
+        """
+        Spins the wheel and calls callback(winner) once it stops. The spin
+        is planned by spin_engine from seed; passing a previous last_spin as
+        plan replays it exactly, starting from its start angle.
+        """
         if self.is_spinning or not self.entries:
             return
+        
+        if not self.image_ready():
+            # Start as soon as the background render for these entries lands
+            self.pending_spin = (callback, seed, plan)
+            return
 
         self.is_spinning = True
+        if np is None:
+            self.start_prefill()
         
-        # Random spin duration and total rotation
-        duration = random.uniform(3.0, 5.0)
-        total_rotation = random.uniform(720, 1440) # At least 2 full spins, up to 4
+        if plan is None:
+            plan = spin_engine.plan_spin(self.angle, seed)
+        self.last_spin = plan
         
-        start_time = time.time()
-        start_angle = self.angle
+        start_time = time.perf_counter()
+        scheduler = self.frame_scheduler
+        scheduler.start(start_time)
+        if instrument.enabled():
+            instrument.PROFILER.begin_session()
         
         def animate():
-            now = time.time()
+            now = time.perf_counter()
+            scheduler.frame_started(now)
             elapsed = now - start_time
             
-            if elapsed < duration:
-                # Ease out cubic
-                t = elapsed / duration
-                t = 1 - pow(1 - t, 3)
-                
-                current_rotation = total_rotation * t
-                self.angle = (start_angle + current_rotation) % 360
+            if not plan.finished(elapsed):
+                self.angle = plan.angle_at(elapsed)
                 self.draw_wheel(fast=True)
-                self.after(16, animate) # ~60 FPS
+                # Wait only for what is left of this frame's budget
+                done = time.perf_counter()
+                if instrument.enabled():
+                    instrument.PROFILER.record("spin.frame", now, done - now)
+                self.after(scheduler.frame_done(done - now, done), animate)
             else:
-                self.angle = (start_angle + total_rotation) % 360
+                self.angle = plan.final_angle
                 self.draw_wheel(fast=False)
                 self.is_spinning = False
+                self.spin_stats = scheduler.stats(now)
                 if callback:
                     winner = self.get_winner()
                     callback(winner)
@@ -209,18 +1357,10 @@ class WheelWidget(tk.Canvas):
     def get_winner(self):
         # With PIL (CW angles) and rotate (CCW), the pointer at 0 (3 o'clock)
         # corresponds to the slice containing the angle 'self.angle'.
-        pointer_angle = self.angle % 360
-        
-        total_weight = sum(e['weight'] for e in self.entries)
-        current_sum = 0
-        
-        for entry in self.entries:
-            slice_angle = (entry['weight'] / total_weight) * 360
-            if current_sum <= pointer_angle < current_sum + slice_angle:
-                return entry
-            current_sum += slice_angle
-            
-        return self.entries[-1]
+        index = self.index_at_angle(self.angle)
+        if index is None:
+            return None
+        return self.entries[index]
 
     def show_notification(self, title, message, color="#3B8ED0"):
         self.delete("overlay")
@@ -236,22 +1376,17 @@ class WheelWidget(tk.Canvas):
         draw.rounded_rectangle([0, 0, card_w-1, card_h-1], radius=20, fill="#333333", outline=color, width=3)
         
         # Fonts
-        try:
-            font_title = ImageFont.truetype("arial.ttf", 24)
-            # Adjust font size based on message length
-            msg_len = len(message)
-            if msg_len < 10:
-                font_size = 32
-            elif msg_len < 20:
-                font_size = 24
-            else:
-                font_size = 16
-            font_msg = ImageFont.truetype("arial.ttf", font_size)
-            font_small = ImageFont.truetype("arial.ttf", 12)
-        except IOError:
-            font_title = ImageFont.load_default()
-            font_msg = ImageFont.load_default()
-            font_small = ImageFont.load_default()
+        font_title = text_render.get_font(24)
+        # Adjust font size based on message length
+        msg_len = len(message)
+        if msg_len < 10:
+            font_size = 32
+        elif msg_len < 20:
+            font_size = 24
+        else:
+            font_size = 16
+        font_msg = text_render.get_font(font_size)
+        font_small = text_render.get_font(12)
             
         # Draw Title
         draw.text((card_w/2, 20), title, font=font_title, fill=color, anchor="mm")